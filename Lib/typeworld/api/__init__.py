@@ -1,17 +1,34 @@
 # -*- coding: utf-8 -*-
 
+import os
 import json
 import copy
-import types
+import codecs
+import collections
+import concurrent.futures
+import multiprocessing
 import inspect
+import itertools
 import re
+import tempfile
 import traceback
+import types
 import datetime
 import markdown2
 import semver
 import functools
+import hashlib
+import marshal
+import math
+import weakref
+import zlib
 import platform
 
+try:
+    import orjson
+except ImportError:  # Optional, see ORJSONCodec
+    orjson = None
+
 
 ###############################################################################
 ###############################################################################
@@ -47,6 +64,12 @@ LOGINREQUIRED = "loginRequired"
 
 PROTOCOLS = ["typeworld"]
 
+# Validation levels, each including the checks of the ones before it
+STRUCTURAL = "structural"
+STANDARD = "standard"
+EXHAUSTIVE = "exhaustive"
+VALIDATIONLEVELS = [STRUCTURAL, STANDARD, EXHAUSTIVE]
+
 
 RESPONSES = {
     SUCCESS: "The request has been processed successfully.",
@@ -613,6 +636,15 @@ def makeSemVer(version):
     return version
 
 
+@functools.lru_cache(maxsize=4096)
+def parseSemVer(version):
+    """Parse simple float number or semver version string into semver.VersionInfo
+    object, using makeSemVer(). Cached by version string, for the most recently
+    used 4096 strings, as these come from the network."""
+
+    return semver.VersionInfo.parse(makeSemVer(version))
+
+
 def ResponsesDocu(responses):
 
     text = "\n\n"
@@ -634,9 +666,47 @@ def ResponsesDocu(responses):
 #  Basic Data Types
 
 
+def _noParent():
+    return None
+
+
+class _ParentLink(object):
+    # Data descriptor for _parent, the container that holds an object. Kept as a weak
+    # reference, so that object trees have no reference cycles and are freed by
+    # reference counting as soon as they are discarded
+
+    # Counts all changes of _parent links, see DictBasedObject._ancestor()
+    generation = 0
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return obj.__dict__.get("_parentRef", _noParent)()
+
+    def __set__(self, obj, value):
+        obj.__dict__["_parentRef"] = weakref.ref(value) if value is not None else _noParent
+        _ParentLink.generation += 1
+
+
+def _liveParent(obj):
+    # obj._parent for the public parent links, raising a ReferenceError rather than returning
+    # None when the container has been freed, which happens once nothing holds the tree's root
+    ref = obj.__dict__.get("_parentRef", _noParent)
+    parent = ref()
+    if parent is None and ref is not _noParent:
+        raise ReferenceError(
+            "The object that held this %s has been freed. Parent links are weak references, so keep "
+            "a reference to the root object, such as the InstallableFontsResponse, while using its parts."
+            % obj.__class__.__name__
+        )
+    return parent
+
+
 class DataType(object):
     initialData = None
     dataType = None
+    _parent = _ParentLink()
+    _frozen = False
 
     def __init__(self):
         self.value = copy.copy(self.initialData)
@@ -679,6 +749,32 @@ class DataType(object):
     def shapeValue(self, value):
         return value
 
+    @classmethod
+    def wrap(cls, value):
+        # Throwaway instance around a raw value as stored in DictBasedObject._content,
+        # so that the instance-level rules (valid(), isEmpty() etc.) can be applied to it
+        wrapper = cls.__new__(cls)
+        wrapper.value = value
+        return wrapper
+
+    @classmethod
+    def shaped(cls, value):
+        # Shape and validate a value for storage, like put() does,
+        # but return the raw value instead of keeping it in a wrapper
+        wrapper = cls.wrap(None)
+        wrapper.value = wrapper.shapeValue(value)
+        valid = wrapper.valid()
+        if valid is not True and valid is not None:
+            raise ValueError(valid)
+        return wrapper.value
+
+    @classmethod
+    def initialValue(cls):
+        # Raw value that a DictBasedObject stores for this data type before anything is set
+        if issubclass(cls, MultiLanguageTextProxy):
+            return cls.dataType()
+        return copy.copy(cls.initialData)
+
     def isEmpty(self):
         return self.value is None or self.value == [] or self.value == ""
 
@@ -720,7 +816,15 @@ class StringDataType(DataType):
 class DictionaryDataType(DataType):
     dataType = dict
 
+    def valid(self):
+        # Frozen objects hold read-only copies, see _frozenValue()
+        if self.value.__class__ is types.MappingProxyType:
+            return True
+        return super().valid()
+
     def shapeValue(self, value):
+        if value.__class__ is types.MappingProxyType:
+            return _thawedValue(value)
         return dict(value)
 
 
@@ -751,12 +855,12 @@ class VersionDataType(StringDataType):
 
         # Append .0 for semver comparison
         try:
-            value = makeSemVer(self.value)
+            makeSemVer(self.value)
         except ValueError:
             return False
 
         try:
-            semver.VersionInfo.parse(value)
+            parseSemVer(self.value)
         except ValueError as e:
             return str(e)
         return True
@@ -894,35 +998,58 @@ class ListProxy(DataType):
     # for each Proxy
     # dataType = str
 
+    # List members are kept as raw values in self.value, shaped and validated
+    # through self.dataType as they come in, but not wrapped individually
+
     def __repr__(self):
         if self.value:
-            return "%s" % ([x.get() for x in self.value])
+            return "%s" % (list(self))
         else:
             return "[]"
 
-    def __getitem__(self, i):
-        return self.value[i].get()
-
-    def __setitem__(self, i, value):
+    def _member(self, i):
+        value = self.value[i]
+        if value.__class__ is _RawSubtree:
+            value = value.materialize()
+            object.__setattr__(value, "_parent", self)
+            self.value[i] = value
+        return value
 
-        if issubclass(value.__class__, (DictBasedObject, Proxy, ListProxy, DataType)):
+    def _shaped(self, value):
+        value = self.dataType.shaped(value)
+        if issubclass(value.__class__, (DictBasedObject, ListProxy, DataType)):
+            if value._frozen and isinstance(value, DictBasedObject):
+                value = value._cowCopy()
             object.__setattr__(value, "_parent", self)
+        return value
 
-        self.value[i].put(value)
-        object.__setattr__(self.value[i], "_parent", self)
+    def __getitem__(self, i):
+        return self._member(i)
+
+    def __setitem__(self, i, value):
+        if self._frozen or _RawSubtree.sharing:
+            self._willChange()
+        self.value[i] = self._shaped(value)
+        self._changed()
 
     def __delitem__(self, i):
+        if self._frozen or _RawSubtree.sharing:
+            self._willChange()
         del self.value[i]
+        self._changed()
 
     def __iter__(self):
-        for element in self.value:
-            yield element.get()
+        # Index based, so that the list may change while being iterated, like a plain list
+        i = 0
+        while i < len(self.value):
+            yield self._member(i)
+            i += 1
 
     def __len__(self):
         return len(self.value)
 
     def index(self, item):
-        return [x.get() for x in self.value].index(item)
+        return list(self).index(item)
 
     def get(self):
         return self
@@ -932,19 +1059,18 @@ class ListProxy(DataType):
         if not type(values) in (list, tuple):
             raise ValueError("Wrong data type. Is %s, should be: %s." % (type(values), list))
 
+        if self._frozen or _RawSubtree.sharing:
+            self._willChange()
         self.value = []
+        self._changed()
         for value in values:
             self.append(value)
 
     def append(self, value):
-
-        newData = self.dataType()
-        newData.put(value)
-
-        self.value.append(newData)
-
-        if issubclass(newData.__class__, (DictBasedObject, Proxy, ListProxy, DataType)):
-            object.__setattr__(newData, "_parent", self)
+        if self._frozen or _RawSubtree.sharing:
+            self._willChange()
+        self.value.append(self._shaped(value))
+        self._changed()
 
     def extend(self, values):
         for value in values:
@@ -961,6 +1087,18 @@ class ListProxy(DataType):
         else:
             return not bool(self.value)
 
+    def _changed(self):
+        parent = getattr(self, "_parent", None)
+        if parent is not None:
+            parent._changed()
+
+    def _willChange(self):
+        if self._frozen:
+            raise ValueError("%s is frozen. Change a copy.deepcopy() of it instead." % self.__class__.__name__)
+        parent = self._parent
+        if parent is not None:
+            parent._willChange()
+
     # def valid(self):
 
     #     if self.value:
@@ -970,11 +1108,596 @@ class ListProxy(DataType):
     #     return True
 
 
+class _RawSubtree(object):
+    # Raw dict of a DictBasedObject that loadDict(lazy=True) has kept
+    # unmaterialized. Turned into the real object on first attribute or list access.
+    #
+    # Made with share() instead, it stands for an object in another tree that
+    # DictBasedObject.__deepcopy__() shares with the copy, in .node. It turns into
+    # a copy of that object on first access. Should the shared object change before,
+    # DictBasedObject._willChange() gives it a snapshot of the object with detach().
+
+    __slots__ = ("dataType", "data", "fingerprint", "node", "shared", "__weakref__")
+
+    # Number of placeholders that still share an object of another tree
+    sharing = 0
+
+    # Counts the objects added to _sharedBy lists, see DictBasedObject._willChange()
+    shares = 0
+
+    def __init__(self, dataType, data, node=None):
+        self.dataType = dataType
+        self.data = data
+        self.fingerprint = None
+        self.node = node
+        self.shared = False
+
+    @classmethod
+    def share(cls, node):
+        placeholder = cls(node.__class__, None, node)
+        placeholder.shared = True
+        _RawSubtree.sharing += 1
+        if not node._frozen:
+            sharedBy = node.__dict__.setdefault("_sharedBy", [])
+            sharedBy.append(weakref.ref(placeholder))
+            _RawSubtree.shares += 1
+            # Dead references of copies that are gone are dropped at every power of two from 64 on,
+            # so the list of an object that never changes stays within twice the live placeholders
+            size = len(sharedBy)
+            if size >= 64 and not size & (size - 1):
+                sharedBy[:] = [ref for ref in sharedBy if ref() is not None]
+        return placeholder
+
+    def materialize(self):
+        if self.node is None:
+            o = self.dataType()
+            o.loadDict(self.data, lazy=True)
+            if self.fingerprint is not None:
+                o._fingerprint = self.fingerprint[1:]
+            return o
+        if self.shared:
+            self.release()
+            return self.node._cowCopy()
+        return self.node
+
+    def detach(self, node):
+        if self.shared and self.node is node:
+            self.release()
+            self.node = node._cowCopy()
+
+    def release(self):
+        if self.shared:
+            self.shared = False
+            _RawSubtree.sharing -= 1
+
+    def __del__(self):
+        self.release()
+
+
+def _isLazyType(memberType):
+    # MultiLanguageText leaves are cheap and mostly needed for display anyway
+    return not issubclass(memberType, MultiLanguageText)
+
+
+def _loadPlainAttribute(obj, key, dataType, memberType, value, lazy=False):
+    value = dataType.shaped(value)
+    if issubclass(value.__class__, DictBasedObject):
+        object.__setattr__(value, "_parent", obj)
+    obj._content[key] = value
+
+
+def _loadProxyAttribute(obj, key, dataType, memberType, value, lazy=False):
+    # value may also be an object already built by _IncrementalJSONLoader
+    if isinstance(value, DictBasedObject):
+        _loadPlainAttribute(obj, key, dataType, memberType, value)
+    elif lazy and _isLazyType(memberType):
+        obj._content[key] = _RawSubtree(memberType, value)
+    else:
+        o = memberType()
+        o.loadDict(value, lazy=lazy)
+        _loadPlainAttribute(obj, key, dataType, memberType, o)
+
+
+def _loadListProxyAttribute(obj, key, dataType, memberType, values, lazy=False):
+    _list = dataType()
+    _list._parent = obj
+    for item in values:
+        if isinstance(item, DictBasedObject):
+            _list.append(item)
+        elif memberType and lazy and _isLazyType(memberType):
+            _list.value.append(_RawSubtree(memberType, item))
+        elif memberType:
+            o = memberType()
+            o.loadDict(item, lazy=lazy)
+            _list.append(o)
+        else:
+            _list.append(item)
+    obj._content[key] = _list
+
+
+def _shareMember(item, holder):
+    # Copy of a _content value for DictBasedObject._cowCopy(): lazily loaded objects are shared
+    # through _RawSubtree placeholders, lists are copied, and scalars are immutable anyway
+    if item.__class__ is _RawSubtree:
+        return item if item.node is None else _RawSubtree.share(item.node)
+    if isinstance(item, DictBasedObject):
+        if _isLazyType(item.__class__):
+            return _RawSubtree.share(item)
+        o = item._cowCopy()
+        object.__setattr__(o, "_parent", holder)
+        return o
+    if isinstance(item, ListProxy):
+        cls = item.__class__
+        o = cls.__new__(cls)
+        o.value = [_shareMember(member, o) for member in item.value]
+        o._parent = holder
+        return o
+    if item.__class__ is types.MappingProxyType:
+        return _thawedValue(item)
+    if isinstance(item, (dict, list)):
+        return copy.deepcopy(item)
+    return item
+
+
+def _frozenValue(item):
+    # Read-only deep copy of a dictionary in _content for DictBasedObject.freeze(),
+    # with MappingProxyType for dicts and tuples for lists
+    if isinstance(item, dict):
+        return types.MappingProxyType({key: _frozenValue(value) for key, value in item.items()})
+    if isinstance(item, list):
+        return tuple([_frozenValue(member) for member in item])
+    return item
+
+
+def _thawedValue(item):
+    # Plain dict and list copy of a _frozenValue() result, for dumpDict(), the JSON codecs and snapshots
+    if item.__class__ is types.MappingProxyType:
+        return {key: _thawedValue(value) for key, value in item.items()}
+    if item.__class__ is tuple:
+        return [_thawedValue(member) for member in item]
+    return item
+
+
+def _serializeMember(item):
+    if item.__class__ is _RawSubtree:
+        if item.node is not None:
+            return item.node._serialize()
+        return item.data
+    if isinstance(item, DictBasedObject):
+        return item._serialize()
+    if isinstance(item, ListProxy):
+        return [_serializeMember(member) for member in item.value]
+    if item.__class__ is types.MappingProxyType:
+        return _thawedValue(item)
+    return item
+
+
+class _JSONSplice(object):
+    # Part of a _jsonValue() result that holds frozen objects: either a frozen object,
+    # written out from its cached fragment, or a dict or list with such parts in it
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+
+def _jsonValue(item):
+    # Like _serializeMember(), but frozen objects are left as they are, wrapped in
+    # _JSONSplice together with the dicts and lists that hold them, for _jsonText()
+    if item.__class__ is _RawSubtree:
+        if item.node is None:
+            return item.data
+        item = item.node
+    if isinstance(item, DictBasedObject):
+        if item._frozen:
+            return _JSONSplice(item)
+        value = {}
+        spliced = False
+        for key, member in item._serializedContent():
+            member = value[key] = _jsonValue(member)
+            spliced = spliced or member.__class__ is _JSONSplice
+    elif isinstance(item, ListProxy):
+        value = [_jsonValue(member) for member in item.value]
+        spliced = any(member.__class__ is _JSONSplice for member in value)
+    elif item.__class__ is types.MappingProxyType:
+        return _thawedValue(item)
+    else:
+        return item
+    return _JSONSplice(value) if spliced else value
+
+
+def _jsonText(value, pretty, level=0):
+    # JSON text of a _jsonValue() result, the same as jsonCodec.dumps() of the whole
+    # dumpDict() would write it. Pretty text is indented to sit at the given level.
+    if value.__class__ is not _JSONSplice:
+        text = jsonCodec.dumps(value, compact=not pretty)
+    elif isinstance(value.value, DictBasedObject):
+        text = value.value._jsonFragment(pretty)
+    else:
+        value = value.value
+        if isinstance(value, dict):
+            keys = sorted(value) if pretty else value
+            separator = ": " if pretty else ":"
+            opening, closing = "{", "}"
+            parts = [
+                jsonCodec.dumps(key, compact=not pretty) + separator + _jsonText(value[key], pretty, level + 1)
+                for key in keys
+            ]
+        else:
+            opening, closing = "[", "]"
+            parts = [_jsonText(member, pretty, level + 1) for member in value]
+        if not pretty:
+            return opening + ",".join(parts) + closing
+        indent = "\n" + "    " * (level + 1)
+        return opening + indent + ("," + indent).join(parts) + "\n" + "    " * level + closing
+    if pretty and level:
+        text = text.replace("\n", "\n" + "    " * level)
+    return text
+
+
+def _fingerprintMember(item):
+    # Fingerprint text of a _content value: a digest for objects and dictionaries,
+    # the members in brackets for lists and the value itself for scalars
+    if item.__class__ is _RawSubtree:
+        if item.node is not None:
+            return "#" + item.node.fingerprint()
+        if item.fingerprint is None:
+            # The raw dict may hold defaults, empty values and unknown keys that loading
+            # leaves out, so it is loaded (lazily again) to be fingerprinted like loaded objects
+            item.fingerprint = "#" + item.materialize().fingerprint()
+        return item.fingerprint
+    if isinstance(item, DictBasedObject):
+        return "#" + item.fingerprint()
+    if isinstance(item, ListProxy):
+        return _fingerprintMember(item.value)
+    if isinstance(item, (dict, types.MappingProxyType)):
+        parts = ["{"]
+        for key in sorted(item):
+            parts.append(repr(key))
+            parts.append(_fingerprintMember(item[key]))
+        return "#" + _digest(parts)
+    if isinstance(item, (list, tuple)):
+        return "[%s]" % "".join([_fingerprintMember(member) for member in item])
+    # repr() tells apart the same scalars that JSON does (1, 1.0, True, "1"),
+    # and escapes control characters so that \0 ends a value unambiguously
+    return "=%r\0" % (item,)
+
+
+# Values that are immutable and hashable, so that one shaped value may be kept for all equal ones
+_scalarTypes = (str, int, float, bool, type(None))
+
+
+def _digest(parts):
+    return hashlib.blake2b("".join(parts).encode(), digest_size=20).hexdigest()
+
+
+# Binary snapshots, see DictBasedObject.dumpSnapshot(): the magic bytes and the schema digest,
+# then the zlib compressed marshal data of (class names, root). Objects are (index into the
+# class names, _content, fingerprint() as bytes or None) tuples, and lists are (index, members)
+# tuples; other values stay as they are. Increase _snapshotFormat when this layout,
+# the meaning of _content values or the fingerprint() digest changes.
+_snapshotMagic = b"TWSNAP"
+_snapshotFormat = 1
+
+
+@functools.lru_cache(maxsize=None)
+def _snapshotSchema():
+    # (header, {name: class}) of the classes that snapshots may contain. The header's digest
+    # covers their names, keys, data types, required flags and default values, so that
+    # snapshots of another schema are rejected.
+    classes = {}
+    stack = [DictBasedObject, DataType]
+    while stack:
+        cls = stack.pop()
+        stack.extend(cls.__subclasses__())
+        if cls.__module__ == __name__:
+            classes[cls.__name__] = cls
+
+    parts = [str(_snapshotFormat), str(marshal.version)]
+    for name in sorted(classes):
+        cls = classes[name]
+        parts.append(name)
+        dataType = cls.__dict__.get("dataType")
+        if isinstance(dataType, type):
+            parts.append(dataType.__name__)
+        if "initialData" in cls.__dict__:
+            parts.append(repr(cls.initialData))
+        for key in sorted(cls.__dict__.get("_structure", {})):
+            dataType, required, default = cls._structure[key][:3]
+            parts.append("%s:%s:%s:%r" % (key, dataType.__name__, required, default))
+        parts.extend(cls.__dict__.get("_possible_keys", []))
+    return _snapshotMagic + hashlib.blake2b("\0".join(parts).encode(), digest_size=16).digest(), classes
+
+
+def _snapshotMember(item, classes):
+    # Snapshot form of a _content value, collecting the classes involved in classes: {class: index}
+    if item.__class__ is _RawSubtree:
+        if item.node is not None:
+            item = item.node
+        else:
+            o = item.dataType()
+            o.loadDict(item.data, lazy=True)
+            item = o
+    if isinstance(item, DictBasedObject):
+        return (
+            classes.setdefault(item.__class__, len(classes)),
+            {key: _snapshotMember(value, classes) for key, value in item._content.items()},
+            bytes.fromhex(item._fingerprint) if item._fingerprint else None,
+        )
+    if isinstance(item, ListProxy):
+        members = [_snapshotMember(member, classes) for member in item.value]
+        return (classes.setdefault(item.__class__, len(classes)), members)
+    if item.__class__ is types.MappingProxyType:
+        return _thawedValue(item)
+    return item
+
+
+def _restoreContent(obj, content, classes):
+    # _content for obj from snapshot data, trusting it to be shaped and valid already.
+    # classes: [(class, is a ListProxy)] by index
+    parentRef = weakref.ref(obj)
+    return {
+        key: _restoreMember(value, classes, parentRef) if value.__class__ is tuple else value
+        for key, value in content.items()
+    }
+
+
+def _restoreMember(item, classes, parentRef):
+    # Builds objects with __new__() and fills in their __dict__ like __init__() would,
+    # setting the _parent links directly (see DictBasedObject.loadSnapshot())
+    cls, isList = classes[item[0]]
+    o = cls.__new__(cls)
+    if isList:
+        memberRef = weakref.ref(o)
+        o.__dict__["value"] = [
+            _restoreMember(member, classes, memberRef) if member.__class__ is tuple else member for member in item[1]
+        ]
+    else:
+        fingerprint = item[2]
+        o.__dict__.update(
+            _content=_restoreContent(o, item[1], classes),
+            _dirty=True,
+            _validationCache=None,
+            _fingerprint=fingerprint.hex() if fingerprint else None,
+            _indexes=None,
+        )
+    o.__dict__["_parentRef"] = parentRef
+    return o
+
+
+class _Field(object):
+    # Data descriptor that DictBasedObject generates for each key of a class' _structure
+    # (and each of its _possible_keys), reading and writing the raw value in _content
+
+    __slots__ = ("key", "dataType")
+
+    def __init__(self, key, dataType):
+        self.key = key
+        self.dataType = dataType
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        content = obj._content
+        if self.key not in content:
+            # Frozen objects hand out an unset key's default without storing it
+            if obj._frozen:
+                return obj._frozenDefault(self.key)
+            obj.initAttr(self.key)
+        value = content[self.key]
+        if value.__class__ is _RawSubtree:
+            value = value.materialize()
+            object.__setattr__(value, "_parent", obj)
+            content[self.key] = value
+        return value
+
+    def __set__(self, obj, value):
+        if obj._frozen or _RawSubtree.sharing:
+            obj._willChange()
+        content = obj._content
+        if self.key not in content:
+            obj.initAttr(self.key)
+
+        if issubclass(value.__class__, (DictBasedObject, ListProxy, DataType)):
+            # A frozen object stays in its own tree; this one gets a copy of it
+            if value._frozen and isinstance(value, DictBasedObject):
+                value = value._cowCopy()
+            object.__setattr__(value, "_parent", obj)
+
+        if issubclass(self.dataType, ListProxy):
+            content[self.key].put(value)
+        else:
+            content[self.key] = self.dataType.shaped(value)
+        obj._changed(key=self.key)
+
+
+class _LanguageField(_Field):
+    # _Field for the language keys of MultiLanguageText. Only languages that are set
+    # are kept in _content, so that a text costs as much as the languages it holds
+
+    __slots__ = ()
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return obj._content.get(self.key)
+
+    def __set__(self, obj, value):
+        if obj._frozen or _RawSubtree.sharing:
+            obj._willChange()
+        value = self.dataType.shaped(value)
+        if value is None or value == "":
+            obj._content.pop(self.key, None)
+        else:
+            obj._content[self.key] = value
+        obj._changed(key=self.key)
+
+
+class JSONCodec(object):
+    """\
+    Reads and writes JSON with the json module of the standard library.
+
+    DictBasedObject.loadJSON() and .dumpJSON() and the client's JSON preferences use
+    the codec in typeworld.api.jsonCodec. That is an ORJSONCodec where orjson is
+    installed; assign another codec to it to change that.
+
+    loads() takes str or bytes. dumps() returns str, indented with sorted keys for
+    reading, or without whitespace for storage with compact=True. It raises
+    ValueError for NaN and Infinity, which JSON has no notation for.
+    """
+
+    name = "json"
+
+    def loads(self, data):
+        return json.loads(data)
+
+    def dumps(self, obj, compact=False):
+        if compact:
+            return json.dumps(obj, separators=(",", ":"), allow_nan=False)
+        return json.dumps(obj, indent=4, sort_keys=True, allow_nan=False)
+
+
+class ORJSONCodec(JSONCodec):
+    """\
+    JSONCodec using orjson, which parses bytes without decoding them first.
+
+    The data read is the same as with JSONCodec. orjson reads integers beyond 64 bits
+    as floats, so data with runs of 19 or more digits is read by JSONCodec, as are
+    invalid JSON as well as NaN and Infinity, so they are read or rejected the same
+    way. Indented output comes from JSONCodec, as orjson indents by two spaces only.
+    Compact output holds non-ASCII characters as they are rather than as \\u escapes
+    and leaves integers beyond 64 bits to JSONCodec. orjson writes NaN and Infinity as
+    null, so output with null in it is checked for them, to raise ValueError like JSONCodec.
+    """
+
+    name = "orjson"
+
+    # Runs of 19 or more digits, which integers beyond 64 bits have, turn into runs of
+    # zeros. Digits in strings and long fractions match too, and are merely read by JSONCodec.
+    _digitsToZeros = (bytes.maketrans(b"123456789", b"000000000"), str.maketrans("123456789", "000000000"))
+
+    def loads(self, data):
+        if isinstance(data, str):
+            longDigits = "0" * 19 in data.translate(self._digitsToZeros[1])
+        else:
+            longDigits = b"0" * 19 in bytes(data).translate(self._digitsToZeros[0])
+        if longDigits:
+            return super().loads(data)
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return super().loads(data)
+
+    def dumps(self, obj, compact=False):
+        if compact:
+            try:
+                data = orjson.dumps(obj)
+            except TypeError:  # Integers beyond 64 bits
+                pass
+            else:
+                if b"null" in data:
+                    _rejectNonFinite(obj)
+                return data.decode()
+        return super().dumps(obj, compact=compact)
+
+
+def _rejectNonFinite(obj):
+    # Raises ValueError like json.dumps(allow_nan=False) if obj holds NaN or Infinity
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, float):
+            if not math.isfinite(item):
+                raise ValueError("Out of range float values are not JSON compliant")
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+
+
+# The codec behind DictBasedObject.loadJSON() and .dumpJSON(), see JSONCodec
+jsonCodec = ORJSONCodec() if orjson else JSONCodec()
+
+
 class DictBasedObject(object):
+    _parent = _ParentLink()
     _structure = {}
     _deprecatedKeys = []
     _possible_keys = []
     _dataType_for_possible_keys = None
+    _field_for_possible_keys = _Field
+    _frozen = False
+
+    # Keys whose changes invalidate the lookup indexes of the enclosing
+    # InstallableFontsResponse and Foundry
+    _indexedKeys = ()
+
+    # Keys whose objects and list members dumpJSONChunks() writes one at a time
+    _streamedKeys = ()
+
+    # Counts everything that makes objects valid again: fingerprints, validation results
+    # and lookup indexes being built. See _changed().
+    _cleanings = 0
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for key in cls._structure:
+            setattr(cls, key, _Field(key, cls._structure[key][0]))
+        for key in cls._possible_keys:
+            setattr(cls, key, cls._field_for_possible_keys(key, cls._dataType_for_possible_keys))
+
+    @classmethod
+    def _loaderPlan(cls):
+        # {key: (loader, dataType, memberType)} for loadDict(), compiled once per class
+        # from its _structure and cached on the class itself
+        if "_cachedLoaderPlan" not in cls.__dict__:
+            plan = {}
+            for key in cls._structure:
+                dataType = cls._structure[key][0]
+                if issubclass(dataType, Proxy):
+                    plan[key] = (_loadProxyAttribute, dataType, dataType.dataType)
+                elif issubclass(dataType, ListProxy):
+                    memberType = getattr(dataType.dataType, "dataType", None)
+                    if not (inspect.isclass(memberType) and issubclass(memberType, DictBasedObject)):
+                        memberType = None
+                    plan[key] = (_loadListProxyAttribute, dataType, memberType)
+                else:
+                    plan[key] = (_loadPlainAttribute, dataType, None)
+            cls._cachedLoaderPlan = plan
+        return cls.__dict__["_cachedLoaderPlan"]
+
+    @classmethod
+    def _recordPlan(cls):
+        # {key: (kind, dataType, memberType)} for fromRecords(), compiled once per class like
+        # _loaderPlan(). kind is "value", "object", "objects" (a list of objects), "values"
+        # (a list of plain values) or "text" (a language of MultiLanguageText).
+        if "_cachedRecordPlan" not in cls.__dict__:
+            plan = {}
+            for key, (loader, dataType, memberType) in cls._loaderPlan().items():
+                if loader is _loadProxyAttribute:
+                    plan[key] = ("object", dataType, memberType)
+                elif loader is _loadListProxyAttribute:
+                    plan[key] = ("objects" if memberType else "values", dataType, memberType)
+                else:
+                    plan[key] = ("value", dataType, None)
+            for key in cls._possible_keys:
+                field = getattr(cls, key, None)
+                if isinstance(field, _LanguageField):
+                    plan[key] = ("text", field.dataType, None)
+            cls._cachedRecordPlan = plan
+        return cls.__dict__["_cachedRecordPlan"]
+
+    @classmethod
+    def _recordTemplate(cls):
+        # (_content, keys with other default values) of a new object. The _content holds the
+        # scalar default values, and None in place of the others to keep the order of the keys.
+        if "_cachedRecordTemplate" not in cls.__dict__:
+            content = dict(cls()._content)
+            defaults = [key for key, value in content.items() if value.__class__ not in _scalarTypes]
+            for key in defaults:
+                content[key] = None
+            cls._cachedRecordTemplate = (content, defaults)
+        return cls.__dict__["_cachedRecordTemplate"]
 
     def __copy__(self):
         cls = self.__class__
@@ -983,16 +1706,105 @@ class DictBasedObject(object):
         return result
 
     def __deepcopy__(self, memo):
+        # Copy-on-write: the copy shares all objects below it with this one (see _RawSubtree),
+        # and either side makes its own copy of an object when it first accesses or changes it
+        return self._cowCopy()
+
+    def _cowCopy(self):
+        # Copy of this object, with _content values passed through _shareMember()
         cls = self.__class__
-        obj = cls()
-        obj.loadJSON(self.dumpJSON())
-        return obj
+        o = cls.__new__(cls)
+        o._content = {}
+        o._dirty = True
+        o._validationCache = None
+        o._fingerprint = self._fingerprint
+        o._indexes = None
+        for key, value in self._content.items():
+            o._content[key] = _shareMember(value, o)
+        return o
+
+    def _willChange(self):
+        # Called before this object or anything in it changes. Copies that still share
+        # it or one of its ancestors get their own snapshot of the path down to it first.
+        # Objects on the path are stamped as having no shared ancestors then, so that later
+        # changes in the same tree stop there, until another object is shared or relinked.
+        if self._frozen:
+            raise ValueError("%s is frozen. Change a copy.deepcopy() of it instead." % self.__class__.__name__)
+        stamp = (_RawSubtree.shares, _ParentLink.generation)
+        path = []
+        node = self
+        while node is not None and node.__dict__.get("_unshared") != stamp:
+            path.append(node)
+            node = node._parent
+        if not path:
+            return
+        for node in reversed(path):
+            for ref in node.__dict__.pop("_sharedBy", ()):
+                placeholder = ref()
+                if placeholder is not None:
+                    placeholder.detach(node)
+        # Detaching shares objects below the path only
+        stamp = (_RawSubtree.shares, _ParentLink.generation)
+        for node in path:
+            node.__dict__["_unshared"] = stamp
+
+    def freeze(self):
+        # Turns this object and all objects below it into a read-only snapshot that several
+        # threads can read at the same time without locking. Lazily loaded parts are loaded,
+        # dictionaries such as Foundry.styling are replaced by read-only copies, and the
+        # fingerprint, lookup tables and lists derived from the data, such as
+        # Font.getVersions(), are built right away. Changing the snapshot raises a ValueError
+        # afterwards; copy.deepcopy() of it returns a changeable copy. Returns the object itself.
+        nodes = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            nodes.append(node)
+            for key, value in list(node._content.items()):
+                if value.__class__ is _RawSubtree:
+                    value = getattr(node, key)
+                if isinstance(value, DictBasedObject):
+                    stack.append(value)
+                elif isinstance(value, dict):
+                    node._content[key] = _frozenValue(value)
+                elif isinstance(value, ListProxy):
+                    nodes.append(value)
+                    for i, member in enumerate(value.value):
+                        if member.__class__ is _RawSubtree:
+                            member = value._member(i)
+                        if isinstance(member, DictBasedObject):
+                            stack.append(member)
+
+        # Parent links are weak, so every part holds on to the snapshot's root. Readers that
+        # keep only a font of a replaced snapshot can still follow its parents. The cycles
+        # this makes are left to the garbage collector, as snapshots are long-lived anyway.
+        self.fingerprint()
+        for node in nodes:
+            node._frozen = True
+            if node is not self:
+                node._root = self
+            if hasattr(node, "_index"):
+                node._index()
+        for node in nodes:
+            if hasattr(node, "_deriveFrozen"):
+                node._deriveFrozen()
+        return self
+
+    def _frozenDefault(self, key):
+        value = self._initialValue(key)
+        if isinstance(value, DictBasedObject):
+            value.freeze()
+            value._root = self.__dict__.get("_root", self)
+        elif isinstance(value, ListProxy):
+            value._frozen = True
+            value._root = self.__dict__.get("_root", self)
+        elif isinstance(value, dict):
+            value = _frozenValue(value)
+        return value
 
     def sameContent(self, other):
         #        return self.difference(other) == {}
-        return json.dumps(self.dumpDict(validate=False), sort_keys=True) == json.dumps(
-            other.dumpDict(validate=False), sort_keys=True
-        )
+        return self.fingerprint() == other.fingerprint()
 
     # def difference(self, other):
 
@@ -1251,12 +2063,13 @@ class DictBasedObject(object):
 
         super(DictBasedObject, self).__init__()
 
-        object.__setattr__(self, "_content", {})
-        object.__setattr__(
-            self,
-            "_allowedKeys",
-            set(self._structure.keys()) | set(self._possible_keys),
-        )
+        self._content = {}
+
+        # See Validator, fingerprint() and _index()
+        self._dirty = True
+        self._validationCache = None
+        self._fingerprint = None
+        self._indexes = None
 
         # Fill default values
         for key in self._structure:
@@ -1272,239 +2085,1150 @@ class DictBasedObject(object):
 
     def initAttr(self, key):
 
+        # _content holds raw values: plain Python values for scalar keys,
+        # DictBasedObjects for Proxy keys and a ListProxy container for list keys.
+        # Typing and validation rules live with the data type classes in _structure.
         if key not in self._content:
 
-            if key in list(object.__getattribute__(self, "_structure").keys()):
-                self._content[key] = object.__getattribute__(self, "_structure")[key][0]()
+            self._content[key] = self._initialValue(key)
 
-            elif key in self._possible_keys:
-                self._content[key] = self._dataType_for_possible_keys()
+            # Required keys are dumped even with their default value
+            if key in self._structure and self._structure[key][1]:
+                self._changed(revalidate=False, key=key)
 
-            self._content[key]._parent = self
+    def _initialValue(self, key):
+        dataType = getattr(type(self), key).dataType
+        if issubclass(dataType, ListProxy):
+            value = dataType()
+        else:
+            value = dataType.initialValue()
 
-    def __getattr__(self, key):
+        # The new value has no descendants with _ancestor() lookups to invalidate yet,
+        # so its link is set without counting a change (see _ParentLink.generation)
+        if issubclass(value.__class__, (DictBasedObject, ListProxy)):
+            value.__dict__["_parentRef"] = weakref.ref(self)
+        return value
 
-        if key in self._allowedKeys:
-            self.initAttr(key)
-            return self._content[key].get()
+    def _changed(self, revalidate=True, key=None):
+        # Flag this object and all its ancestors for re-validation and a new fingerprint.
+        # Lookup indexes are dropped unless only a key outside of _indexedKeys changed.
+        #
+        # Each object on the way is stamped with what has been flagged. Until the next time
+        # anything anywhere is made valid again (_cleanings) or relinked, an object with such a
+        # stamp has its ancestors flagged already, so further changes below it stop there.
+        reindex = key is None or key in self._indexedKeys
+        stamp = (DictBasedObject._cleanings, _ParentLink.generation)
+        node = self
+        while node is not None:
+            d = node.__dict__
+            if isinstance(node, DictBasedObject):
+                if revalidate:
+                    d["_dirty"] = True
+                d["_fingerprint"] = None
+                if reindex:
+                    d["_indexes"] = None
+                flagged = d.get("_flagged")
+                if flagged is None or flagged[0] != stamp:
+                    d["_flagged"] = (stamp, revalidate, reindex)
+                elif (flagged[1] or not revalidate) and (flagged[2] or not reindex):
+                    break
+                else:
+                    d["_flagged"] = (stamp, flagged[1] or revalidate, flagged[2] or reindex)
+            node = d.get("_parentRef", _noParent)()
 
+    def _isEmptyKey(self, key):
+        value = self._content[key]
+        if issubclass(value.__class__, ListProxy):
+            return value.isEmpty()
+        return self._structure[key][0].wrap(value).isEmpty()
+
+    def set(self, key, value):
+        setattr(self, key, value)
+
+    def get(self, key):
+        return getattr(self, key)
+
+    def _owner(self):
+        # The object that holds this one, directly or in one of its lists
+        parent = _liveParent(self)
+        if isinstance(parent, ListProxy):
+            parent = _liveParent(parent)
+        return parent
+
+    def _ancestor(self, cls):
+        # The closest enclosing object of class cls, such as the InstallableFontsResponse of a Font.
+        # Found ancestors are kept as weak references until any _parent link in any tree changes.
+        cache = self.__dict__.get("_ancestors")
+        if cache is None or cache[0] != _ParentLink.generation:
+            cache = (_ParentLink.generation, {})
+            self._ancestors = cache
+        ref = cache[1].get(cls)
+        if ref is not None and (ref is _noParent or ref() is not None):
+            return ref()
+
+        node = _liveParent(self)
+        while node is not None and not isinstance(node, cls):
+            node = _liveParent(node)
+        cache[1][cls] = weakref.ref(node) if node is not None else _noParent
+        return node
+
+    @classmethod
+    def _validationPlan(cls):
+        # [(key, required, dataType, memberType)] for Validator, compiled once per class.
+        # memberType is the DictBasedObject class to recurse into, or None.
+        if "_cachedValidationPlan" not in cls.__dict__:
+            plan = []
+            loaderPlan = cls._loaderPlan()
+            for key in cls._structure:
+                loader, dataType, memberType = loaderPlan[key]
+                if not (inspect.isclass(memberType) and issubclass(memberType, DictBasedObject)):
+                    memberType = None
+                plan.append((key, cls._structure[key][1], dataType, memberType))
+            cls._cachedValidationPlan = plan
+        return cls.__dict__["_cachedValidationPlan"]
+
+    def validate(self, strict=True, processes=None, level=EXHAUSTIVE, cache=None):
+
+        # Lists of strings; use Validator directly to get structured ValidationIssue objects.
+        # With processes, large catalogs are validated in that many processes (see ParallelValidator).
+        # level is one of VALIDATIONLEVELS (see Validator).
+        # cache is an optional ValidationCache. It is only used for objects that aren't part of
+        # another one, as their results depend on the designers and licenses around them.
+        if cache is not None and self._parent is None:
+            key = cache.key(self, strict, level)
+            results = cache.get(key)
+            if results is None:
+                results = self.validate(strict=strict, processes=processes, level=level)
+                cache.set(key, results)
+            return results
+
+        if processes:
+            validator = ParallelValidator(strict=strict, processes=processes, level=level)
         else:
-            return object.__getattribute__(self, key)
+            validator = Validator(strict=strict, level=level)
+        information, warnings, critical = validator.validate(self)
+        return formatIssues(information), formatIssues(warnings), formatIssues(critical)
 
-    def __setattr__(self, key, value):
+    def discardThisKey(self, key):
+        return False
 
-        if key in self._allowedKeys:
-            self.initAttr(key)
+    def dumpDict(self, strict=True, validate=True):
 
-            if issubclass(value.__class__, (DictBasedObject, ListProxy, Proxy, DataType)):
-                object.__setattr__(value, "_parent", self)
+        # Auto-validate
+        if validate:
+            information, warnings, critical = Validator(strict=strict).validate(self)
+            if critical:
+                raise ValueError(str(critical[0]))
 
-            self.__dict__["_content"][key].put(value)
+        return self._serialize()
 
-        else:
-            object.__setattr__(self, key, value)
+    def _serializedContent(self):
+        # (key, value) pairs of _content that dumpDict() writes out
 
-    def set(self, key, value):
-        self.__setattr__(key, value)
+        structure = self._structure
 
-    def get(self, key):
-        return self.__getattr__(key)
+        for key, value in self._content.items():
+
+            if self.discardThisKey(key) is not False:
+                continue
+
+            if key in structure and structure[key][1]:
+                yield key, value
+
+            # Untouched lazily loaded subtree: pass raw data through
+            elif value.__class__ is _RawSubtree:
+                yield key, value
 
-    def validate(self, strict=True):
+            elif isinstance(value, ListProxy):
+                if value.value or value.includeEmpty:
+                    yield key, value
 
-        information = []
-        warnings = []
-        critical = []
+            elif value:
+                yield key, value
 
-        def extendWithKey(values, key=None, sourceObject=None):
+    def _serialize(self):
+        # dumpDict() without validation. Walks _content directly; the whole tree
+        # has already been validated once at the root, if at all.
+        return {key: _serializeMember(value) for key, value in self._serializedContent()}
 
-            # Remove duplicates
-            seen = set()
-            seen_add = seen.add
-            values = [x for x in values if not (x in seen or seen_add(x))]
-            #                values = list(set(values))
+    def fingerprint(self):
+        # Digest of the dumpDict() content, built from the fingerprints of the children
+        # and kept until this object or one of its descendants changes
+        if self._fingerprint is None:
+            parts = ["{"]
+            # Keys are unique, so sorting never compares the values
+            for key, value in sorted(self._serializedContent()):
+                parts.append(repr(key))
+                parts.append(_fingerprintMember(value))
+            self._fingerprint = _digest(parts)
+            DictBasedObject._cleanings += 1
+        return self._fingerprint
 
-            _list = []
-            for value in values:
-                if sourceObject and key:
-                    _list.append("%s.%s --> %s --> %s" % (self, key, sourceObject, value))
-                elif key:
-                    _list.append("%s.%s --> %s" % (self, key, value))
+    def loadDict(self, d, lazy=False):
+
+        if self._frozen or _RawSubtree.sharing:
+            self._willChange()
+        plan = self._loaderPlan()
+        self._changed()
+
+        for key in d:
+            if key in plan:
+                loader, dataType, memberType = plan[key]
+                loader(self, key, dataType, memberType, d[key], lazy=lazy)
+
+    @classmethod
+    def fromRecords(cls, records, fields=None):
+        # A list of new objects of this class, one for each record, such as the rows of a
+        # database query. Records are dictionaries like those of dumpDict() or, with fields
+        # naming their keys, tuples of values. Nested objects may be given as dictionaries
+        # or as objects. All objects of a class are built in one pass, and each distinct value
+        # of a key is shaped and type checked only once. As with loadDict(), the rest is left
+        # to validate() or dumpDict() of the response that the objects are put into.
+        if fields is not None:
+            fields = tuple(fields)
+            records = [dict(zip(fields, record)) for record in records]
+        return cls._fromRecords(records)
+
+    @classmethod
+    def _fromRecords(cls, records):
+        plan = cls._recordPlan()
+        template, defaults = cls._recordTemplate()
+        shapedValues = collections.defaultdict(dict)  # {key: {(class, value): shaped value}}
+        pending = collections.defaultdict(list)  # {memberType: [(holder, key or index, record)]}
+
+        def shaped(key, dataType, value):
+            memo = shapedValues[key]
+            if value.__class__ not in _scalarTypes:
+                return dataType.shaped(value)
+            if (value.__class__, value) not in memo:
+                memo[(value.__class__, value)] = dataType.shaped(value)
+            return memo[(value.__class__, value)]
+
+        def adopt(value, holder):
+            if value._frozen:
+                value = value._cowCopy()
+            object.__setattr__(value, "_parent", holder)
+            return value
+
+        objects = []
+        for record in records:
+            # The same state as __init__() gives a new object
+            o = cls.__new__(cls)
+            content = dict(template)
+            o.__dict__.update(_content=content, _dirty=True, _validationCache=None, _fingerprint=None, _indexes=None)
+
+            for key, value in record.items():
+                if key not in plan:
+                    continue
+                kind, dataType, memberType = plan[key]
+
+                if kind == "value":
+                    value = shaped(key, dataType, value)
+                    if isinstance(value, DictBasedObject):
+                        object.__setattr__(value, "_parent", o)
+                    content[key] = value
+
+                elif kind == "text":
+                    value = shaped(key, dataType, value)
+                    if value is None or value == "":
+                        content.pop(key, None)
+                    else:
+                        content[key] = value
+
+                elif kind == "object":
+                    if isinstance(value, DictBasedObject):
+                        content[key] = adopt(dataType.shaped(value), o)
+                    else:
+                        content[key] = None
+                        pending[memberType].append((o, key, value))
+
+                else:
+                    _list = dataType()
+                    _list._parent = o
+                    members = _list.value
+                    for item in value:
+                        if kind == "values":
+                            members.append(shaped(key, dataType.dataType, item))
+                        elif isinstance(item, DictBasedObject):
+                            members.append(adopt(dataType.dataType.shaped(item), _list))
+                        else:
+                            pending[memberType].append((_list, len(members), item))
+                            members.append(None)
+                    content[key] = _list
+
+            for key in defaults:
+                if key not in record:
+                    content[key] = o._initialValue(key)
+                    setattr(o, key, cls._structure[key][2])
+            objects.append(o)
+
+        # Nested objects, each class in one go
+        for memberType, places in pending.items():
+            built = memberType._fromRecords([record for holder, place, record in places])
+            for (holder, place, record), value in zip(places, built):
+                if isinstance(holder, ListProxy):
+                    holder.value[place] = value
                 else:
-                    _list.append("%s --> %s" % (self, value))
-            return _list
+                    holder._content[place] = value
+                object.__setattr__(value, "_parent", holder)
 
-        # Check if required fields are filled
-        for key in list(self._structure.keys()):
+        return objects
 
-            self.initAttr(key)
+    def dumpJSON(self, strict=True, validate=False, compact=False):
+        # compact: no indentation and no key sorting, for storage rather than for reading.
+        # Frozen objects (see freeze()) keep their JSON text once written and it is spliced
+        # into the text of whatever holds them, such as copies of a frozen catalog that
+        # differ in a few places. The text is the same as without freezing.
 
-            if self.discardThisKey(key) is False:
+        # Auto-validate
+        if validate:
+            information, warnings, critical = Validator(strict=strict).validate(self)
+            if critical:
+                raise ValueError(str(critical[0]))
+
+        return _jsonText(_jsonValue(self), not compact)
+
+    def _jsonFragment(self, pretty):
+        # JSON text of this frozen object for _jsonText(), kept as the object can't change anymore
+        fragments = self.__dict__.setdefault("_jsonFragments", {})
+        key = (jsonCodec, pretty)
+        if key not in fragments:
+            fragments[key] = jsonCodec.dumps(self._serialize(), compact=not pretty)
+        return fragments[key]
+
+    def loadJSON(self, j, lazy=False):
+        # j is str or bytes
+        self.loadDict(jsonCodec.loads(j), lazy=lazy)
+
+    def dumpJSONChunks(self, strict=True, validate=False, extend=None, chunkSize=64 * 1024):
+        # Like dumpJSON(compact=True), but as a generator of UTF-8 encoded chunks of about
+        # chunkSize bytes, for use as a WSGI response body or in an ASGI streaming response.
+        # The members of the lists in _streamedKeys, such as Foundry.families and Family.fonts,
+        # are written one at a time, so that neither the whole text nor its dict tree is held
+        # in memory and the first chunk is ready after the first fonts.
+        #
+        # extend is {list: iterable} of more members to write after those of lists in
+        # _streamedKeys, such as families built from the rows of a database cursor as they
+        # are needed. Members may be objects or dictionaries like those of dumpDict().
+        # With validate, they are validated one by one as they come; checks across all
+        # members, such as for duplicate unique IDs, don't cover them.
+        extend = {id(members): (members, iterable) for members, iterable in (extend or {}).items()}
+        for members, iterable in extend.values():
+            owner = members._parent
+            if not any(owner._content.get(key) is members for key in getattr(owner, "_streamedKeys", ())):
+                raise ValueError("Only lists in _streamedKeys can be extended, not %s" % members)
 
-                if strict and self._structure[key][1] and self._content[key].isEmpty():
-                    critical.append("%s.%s is a required attribute, but empty" % (self, key))
+        if validate:
+            information, warnings, critical = Validator(strict=strict).validate(self)
+            if critical:
+                raise ValueError(str(critical[0]))
+
+        parts = []
+        size = 0
+        for part in self._jsonParts(strict, validate, extend):
+            parts.append(part)
+            size += len(part)
+            if size >= chunkSize:
+                yield "".join(parts).encode()
+                parts = []
+                size = 0
+        if parts:
+            yield "".join(parts).encode()
+
+    def _jsonParts(self, strict, validate, extend):
+        # Pieces of the JSON text for dumpJSONChunks(). Keys outside of _streamedKeys, and
+        # objects without any _streamedKeys, are serialized in one piece, and frozen objects
+        # come from their cached fragments.
+        dumps = jsonCodec.dumps
+        serialized = dict(self._serializedContent())
+        opening = "{"
+        for key, value in self._content.items():
+            if key not in serialized and not (id(value) in extend and self.discardThisKey(key) is False):
+                continue
+            yield opening + dumps(key, compact=True) + ":"
+            opening = ","
+
+            if key not in self._streamedKeys:
+                yield _jsonText(_jsonValue(value), False)
+            elif isinstance(value, ListProxy):
+                members = value.value
+                if id(value) in extend:
+                    extended = self._extendedMembers(value, extend[id(value)][1], strict, validate)
+                    members = itertools.chain(members, extended)
+                separator = "["
+                for member in members:
+                    yield separator
+                    separator = ","
+                    if isinstance(member, DictBasedObject) and member._streamedKeys and not member._frozen:
+                        yield from member._jsonParts(strict, validate, extend)
+                    else:
+                        yield _jsonText(_jsonValue(member), False)
+                yield "[]" if separator == "[" else "]"
+            elif isinstance(value, DictBasedObject) and value._streamedKeys and not value._frozen:
+                yield from value._jsonParts(strict, validate, extend)
+            else:
+                yield _jsonText(_jsonValue(value), False)
+
+        yield "{}" if opening == "{" else "}"
+
+    def _extendedMembers(self, members, iterable, strict, validate):
+        # The objects of dumpJSONChunks(extend=) for the list members, attached to it
+        # without being added. Objects of other trees and frozen ones are copied.
+        memberType = members.dataType.dataType
+        for item in iterable:
+            if not isinstance(item, DictBasedObject):
+                item = memberType.fromRecords([item])[0]
+            elif item._frozen or item._parent is not None:
+                item = item._cowCopy()
+            object.__setattr__(item, "_parent", members)
+            if validate:
+                validator = Validator(strict=strict)
+                results = validator.validate(item)
+                validator.customValidation(item, ((item, None, None),), results)
+                if results[2]:
+                    raise ValueError(str(results[2][0]))
+            yield item
+
+    def dumpSnapshot(self):
+        # This object as a compact binary snapshot (bytes) for local caching. Unlike dumpJSON(),
+        # it keeps the object tree as it is, and loadSnapshot() restores it without parsing or
+        # validating anything. Snapshots are only readable with the same data format
+        # (see _snapshotSchema()), so the JSON needs to be kept as well.
+        # Frozen objects keep their snapshot, as they can't change anymore.
+        if self._frozen and "_snapshot" in self.__dict__:
+            return self._snapshot
+        classes = {}
+        root = _snapshotMember(self, classes)
+        names = tuple(cls.__name__ for cls in classes)
+        data = _snapshotSchema()[0] + zlib.compress(marshal.dumps((names, root)))
+        if self._frozen:
+            self._snapshot = data
+        return data
+
+    def loadSnapshot(self, data):
+        # Loads a snapshot made with dumpSnapshot() into this object. Raises ValueError if the
+        # snapshot is damaged, holds another class or was made with a differing data format;
+        # loadJSON() is the fallback then.
+        header, classes = _snapshotSchema()
+        if not data.startswith(header):
+            raise ValueError("Snapshot was made for a different data format.")
+        try:
+            # marshal is for trusted data only, such as the client's own preferences
+            names, root = marshal.loads(zlib.decompress(data[len(header) :]))
+            classes = [(classes[name], issubclass(classes[name], ListProxy)) for name in names]
+            cls = classes[root[0]][0]
+        except (zlib.error, EOFError, TypeError, ValueError, KeyError, IndexError):
+            raise ValueError("Snapshot data is damaged.")
+        if cls is not self.__class__:
+            raise ValueError("Snapshot holds a %s, not a %s." % (cls.__name__, self.__class__.__name__))
+
+        if self._frozen or _RawSubtree.sharing:
+            self._willChange()
+        try:
+            content = _restoreContent(self, root[1], classes)
+        except (TypeError, ValueError, KeyError, IndexError, AttributeError):
+            raise ValueError("Snapshot data is damaged.")
+        # The snapshot's fingerprint holds unless this object has keys that the snapshot lacks
+        keep = root[2] and self._content.keys() <= content.keys()
+        self._changed()
+        self._content.update(content)
+        if keep:
+            self._fingerprint = root[2].hex()
+        _ParentLink.generation += 1
+
+    def loadJSONChunks(self, chunks, maxSize=None, encoding="utf-8"):
+        # Like loadJSON(), but for JSON text arriving in pieces (bytes or str), such as
+        # requests' Response.iter_content(). Child objects are built while the data comes in,
+        # so the whole text and its dict tree are never held in memory next to the objects.
+        # Bytes are decoded with encoding. Raises ValueError for invalid JSON, or once more
+        # than maxSize bytes have arrived.
+        loader = _IncrementalJSONLoader(self.__class__, maxSize=maxSize, encoding=encoding)
+        for chunk in chunks:
+            loader.feed(chunk)
+        self.loadDict(loader.close())
+
+
+class _IncrementalJSONLoader(object):
+    # Parser behind DictBasedObject.loadJSONChunks(). Values that are complete in the
+    # buffer are decoded at once by the json module. Objects and arrays that span chunk
+    # boundaries are assembled here frame by frame. Objects whose DictBasedObject class is
+    # known from the _loaderPlan() of their parent are built as soon as they are complete.
+
+    _whitespace = re.compile(r"[ \t\n\r]*")
+    _decoder = json.JSONDecoder()
+    _constants = (
+        ("true", True),
+        ("false", False),
+        ("null", None),
+        ("NaN", float("nan")),
+        ("Infinity", float("inf")),
+        ("-Infinity", float("-inf")),
+    )
+
+    # Parser states
+    VALUE, VALUEORCLOSE, KEY, KEYORCLOSE, COLON, NEXT, DONE = range(7)
+
+    def __init__(self, rootType, maxSize=None, encoding="utf-8"):
+        self.maxSize = maxSize
+        self.size = 0
+        self.decoder = codecs.getincrementaldecoder(encoding)()
+        self.buffer = ""
+        self.offset, self.lineno, self.colno = 0, 1, 1  # position of the buffer in the data
+        self.pending = None  # chunks held back while waiting for the end of a string
+        self.stack = []  # [container, spec, key] frames; spec as returned by childSpec()
+        self.rootType = rootType
+        self.state = self.VALUE
+        self.result = None
+
+    def feed(self, chunk):
+        self.size += len(chunk)
+        if self.maxSize is not None and self.size > self.maxSize:
+            raise ValueError("JSON data exceeds the maximum size of %s bytes" % self.maxSize)
+        if isinstance(chunk, bytes):
+            chunk = self.decoder.decode(chunk)
+
+        if self.pending is not None:
+            self.pending.append(chunk)
+            if '"' not in chunk:
+                return
+            chunk = "".join(self.pending)
+            self.pending = None
+
+        self.buffer += chunk
+        self.parse(final=False)
+
+    def close(self):
+        self.buffer += "".join(self.pending or []) + self.decoder.decode(b"", final=True)
+        self.pending = None
+        self.parse(final=True)
+        if self.state != self.DONE:
+            raise ValueError("Unexpected end of JSON data")
+        return self.result
+
+    def error(self, message, pos):
+        # Positions count from the start of the data rather than of the buffer; .doc is the buffer
+        e = json.JSONDecodeError(message, self.buffer, pos)
+        if e.lineno == 1:
+            e.colno += self.colno - 1
+        e.lineno += self.lineno - 1
+        e.pos += self.offset
+        e.args = ("%s: line %d column %d (char %d)" % (message, e.lineno, e.colno, e.pos),)
+        return e
+
+    def childSpec(self):
+        # What the next value becomes: ("object", cls), ("list", cls) or None for plain data
+        if not self.stack:
+            return ("object", self.rootType)
+        container, spec, key = self.stack[-1]
+        if spec is None:
+            return None
+        kind, cls = spec
+        if kind == "list":
+            return ("object", cls)
+        entry = cls._loaderPlan().get(key)
+        if entry is None:
+            return None
+        loader, dataType, memberType = entry
+        if loader is _loadProxyAttribute:
+            return ("object", memberType)
+        if loader is _loadListProxyAttribute and memberType:
+            return ("list", memberType)
+        return None
 
+    def build(self, value, spec):
+        if spec is None:
+            return value
+        kind, cls = spec
+        if kind == "object" and isinstance(value, dict):
+            o = cls()
+            o.loadDict(value)
+            return o
+        if kind == "list" and isinstance(value, list):
+            return [self.build(item, ("object", cls)) for item in value]
+        return value
+
+    def add(self, value):
+        if not self.stack:
+            self.result = value
+            self.state = self.DONE
+            return
+        container, spec, key = self.stack[-1]
+        if container.__class__ is dict:
+            container[key] = value
+        else:
+            container.append(value)
+        self.state = self.NEXT
+
+    def closeFrame(self):
+        container, spec, key = self.stack.pop()
+        self.add(self.build(container, spec) if self.stack else container)
+
+    def scalar(self, buffer, pos, final):
+        # (value, end) of a number or constant, or None if it may continue in the next chunk
+        match = json.scanner.NUMBER_RE.match(buffer, pos)
+        if match:
+            # "1", "1." or "1e-" may go on in the next chunk
+            rest = buffer[match.end() : match.end() + 3]
+            if not final and len(rest) < 3 and not rest.strip("0123456789.eE+-"):
+                return None
+            integer, frac, exp = match.groups()
+            if frac or exp:
+                return float(integer + (frac or "") + (exp or "")), match.end()
+            return int(integer), match.end()
+        for name, value in self._constants:
+            if buffer.startswith(name, pos):
+                return value, pos + len(name)
+        if not final and any(name.startswith(buffer[pos:]) for name, value in self._constants):
+            return None
+        raise self.error("Expecting value", pos)
+
+    def string(self, buffer, pos, final):
+        # (string, end) of the string starting at pos, or None if it continues in the next chunk
+        try:
+            return json.decoder.scanstring(buffer, pos + 1)
+        except json.JSONDecodeError as e:
+            if not final and ("Unterminated" in e.msg or e.pos >= len(buffer) - 6):
+                self.pending = []
+                return None
+            raise self.error(e.msg, e.pos)
+
+    def parse(self, final):
+        buffer = self.buffer
+        pos = 0
+        while True:
+            pos = self._whitespace.match(buffer, pos).end()
+            if pos == len(buffer):
+                break
+            char = buffer[pos]
+            state = self.state
+
+            if state == self.VALUE or state == self.VALUEORCLOSE:
+                if char == "]" and state == self.VALUEORCLOSE:
+                    pos += 1
+                    self.closeFrame()
+                elif char == "{" or char == "[":
+                    spec = self.childSpec()
+                    try:
+                        value, end = self._decoder.raw_decode(buffer, pos)
+                    except ValueError:
+                        # Incomplete (or invalid, which the frames will find out)
+                        self.stack.append([{} if char == "{" else [], spec, None])
+                        self.state = self.KEYORCLOSE if char == "{" else self.VALUEORCLOSE
+                        pos += 1
+                    else:
+                        self.add(self.build(value, spec) if self.stack else value)
+                        pos = end
+                else:
+                    if char == '"':
+                        token = self.string(buffer, pos, final)
+                    else:
+                        token = self.scalar(buffer, pos, final)
+                    if token is None:
+                        break
+                    value, pos = token
+                    self.add(value)
+
+            elif state == self.KEY or state == self.KEYORCLOSE:
+                if char == "}" and state == self.KEYORCLOSE:
+                    pos += 1
+                    self.closeFrame()
+                elif char == '"':
+                    token = self.string(buffer, pos, final)
+                    if token is None:
+                        break
+                    self.stack[-1][2], pos = token
+                    self.state = self.COLON
+                else:
+                    raise self.error("Expecting property name enclosed in double quotes", pos)
+
+            elif state == self.COLON:
+                if char != ":":
+                    raise self.error("Expecting ':' delimiter", pos)
+                pos += 1
+                self.state = self.VALUE
+
+            elif state == self.NEXT:
+                isDict = self.stack[-1][0].__class__ is dict
+                if char == ",":
+                    pos += 1
+                    self.state = self.KEY if isDict else self.VALUE
+                elif char == ("}" if isDict else "]"):
+                    pos += 1
+                    self.closeFrame()
                 else:
+                    raise self.error("Expecting ',' delimiter", pos)
 
-                    # recurse
-                    if issubclass(self._content[key].__class__, (Proxy)):
-
-                        if self._content[key].isEmpty() is False:
-                            (newInformation, newWarnings, newCritical,) = self._content[
-                                key
-                            ].value.validate(strict=strict)
-                            information.extend(extendWithKey(newInformation, key))
-                            warnings.extend(extendWithKey(newWarnings, key))
-                            critical.extend(extendWithKey(newCritical, key))
-
-                            # Check custom messages:
-                            if hasattr(self._content[key].value, "customValidation") and isinstance(
-                                self._content[key].value.customValidation,
-                                types.MethodType,
-                            ):
-                                (
-                                    newInformation,
-                                    newWarnings,
-                                    newCritical,
-                                ) = self._content[key].value.customValidation()
-                                information.extend(extendWithKey(newInformation, key, self._content[key]))
-                                warnings.extend(extendWithKey(newWarnings, key, self._content[key]))
-                                critical.extend(extendWithKey(newCritical, key, self._content[key]))
-
-                    # recurse
-                    if issubclass(self._content[key].__class__, (ListProxy)):
-
-                        if self._content[key].isEmpty() is False:
-                            for item in self._content[key]:
-                                if hasattr(item, "validate") and isinstance(item.validate, types.MethodType):
-                                    (
-                                        newInformation,
-                                        newWarnings,
-                                        newCritical,
-                                    ) = item.validate(strict=strict)
-                                    information.extend(extendWithKey(newInformation, key))
-                                    warnings.extend(extendWithKey(newWarnings, key))
-                                    critical.extend(extendWithKey(newCritical, key))
-
-                                # Check custom messages:
-                                if hasattr(item, "customValidation") and isinstance(
-                                    item.customValidation, types.MethodType
-                                ):
-                                    (
-                                        newInformation,
-                                        newWarnings,
-                                        newCritical,
-                                    ) = item.customValidation()
-                                    information.extend(extendWithKey(newInformation, key, item))
-                                    warnings.extend(extendWithKey(newWarnings, key, item))
-                                    critical.extend(extendWithKey(newCritical, key, item))
-
-        # Check custom messages:
-        if (
-            issubclass(self.__class__, BaseResponse)
-            and hasattr(self, "customValidation")
-            and isinstance(self.customValidation, types.MethodType)
-        ):
-            newInformation, newWarnings, newCritical = self.customValidation()
-            information.extend(extendWithKey(newInformation))
-            warnings.extend(extendWithKey(newWarnings))
-            critical.extend(extendWithKey(newCritical))
+            else:
+                raise self.error("Extra data", pos)
 
-        return information, warnings, critical
+        consumed = buffer[:pos]
+        lines = consumed.count("\n")
+        if lines:
+            self.lineno += lines
+            self.colno = pos - consumed.rfind("\n")
+        else:
+            self.colno += pos
+        self.offset += pos
+        self.buffer = buffer[pos:]
 
-    def discardThisKey(self, key):
+
+#  Validation
+
+VALIDATIONMESSAGES = {
+    "requiredAttribute": "%s.%s is a required attribute, but empty",
+    "unknownDesigner": "Has designer '%s', but %s.designers has no matching designer.",
+    "unknownLicense": "Has license '%s', but %s has no matching license.",
+    "duplicateFoundryIDs": "Duplicate unique foundry IDs: %s",
+    "duplicateFamilyIDs": "Duplicate unique family IDs: %s",
+    "duplicateFontIDs": "Duplicate unique family IDs: %s",
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _takesLevel(function):
+    # Whether a customValidation() takes the validation level. Overrides in subclasses
+    # that were written before there were levels don't, and are called without it.
+    try:
+        parameters = inspect.signature(function).parameters
+    except (TypeError, ValueError):
         return False
+    return "level" in parameters or any(p.kind is p.VAR_KEYWORD for p in parameters.values())
 
-    def dumpDict(self, strict=True, validate=True):
 
-        d = {}
+class ValidationIssue(object):
+    """\
+    A single validation message. The object references in .path and .args are
+    only turned into text when the issue is displayed with str().
 
-        # Auto-validate
-        if validate:
-            information, warnings, critical = self.validate(strict=strict)
-            if critical:
-                raise ValueError(critical[0])
+    .path is a tuple of (object, key, sourceObject) steps from the validated object
+    down to the object the issue was found in. .code is a key of VALIDATIONMESSAGES,
+    or None for free text messages returned by customValidation().
+    """
 
-        for key in list(self._content.keys()):
+    __slots__ = ("path", "code", "args")
 
-            if self.discardThisKey(key) is False:
+    def __init__(self, path, code, args):
+        self.path = path
+        self.code = code
+        self.args = args
 
-                attr = getattr(self, key)
+    def __repr__(self):
+        return "<ValidationIssue %s>" % (self.code or "custom")
 
-                if (
-                    # required
-                    (key in self._structure and self._structure[key][1])
-                    # don't know
-                    or attr
-                    # is set
-                    or (hasattr(attr, "isSet") and attr.isSet())
-                ):
+    def __str__(self):
+        parts = []
+        for obj, key, sourceObject in self.path:
+            if sourceObject is not None:
+                parts.append("%s.%s --> %s --> " % (obj, key, sourceObject))
+            elif key:
+                parts.append("%s.%s --> " % (obj, key))
+            else:
+                parts.append("%s --> " % obj)
 
-                    if hasattr(attr, "dumpDict"):
-                        d[key] = attr.dumpDict(strict=strict, validate=validate)
+        if self.code:
+            parts.append(VALIDATIONMESSAGES[self.code] % self.args)
+        else:
+            parts.append(self.args[0])
 
-                    elif issubclass(attr.__class__, (ListProxy)):
-                        d[key] = list(attr)
+        return "".join(parts)
 
-                        if len(d[key]) > 0 and hasattr(d[key][0], "dumpDict"):
-                            d[key] = [x.dumpDict(strict=strict, validate=validate) for x in d[key]]
 
-                    else:
-                        d[key] = attr
+def formatIssues(issues):
+    """Format ValidationIssue objects into strings, dropping duplicates."""
 
-        return d
+    seen = set()
+    seen_add = seen.add
+    messages = []
+    for issue in issues:
+        message = str(issue)
+        if message not in seen:
+            seen_add(message)
+            messages.append(message)
+    return messages
 
-    def loadDict(self, d):
 
-        for key in d:
-            if key in self._allowedKeys:
-
-                if key in self._structure:
-
-                    if issubclass(self._structure[key][0], (Proxy)):
-
-                        try:
-                            exec(
-                                "self.%s = typeworld.api.%s()"
-                                % (
-                                    key,
-                                    self._structure[key][0].dataType.__name__,
-                                )
-                            )
-                        except Exception:
-                            exec(
-                                "self.%s = %s()"
-                                % (
-                                    key,
-                                    self._structure[key][0].dataType.__name__,
-                                )
-                            )
-                        exec("self.%s.loadDict(d[key])" % (key))
-
-                    elif issubclass(self._structure[key][0], (ListProxy)):
-                        _list = self.__getattr__(key)
-                        _list.value = []
-                        # allow empty
-                        # if self._structure[key][0].includeEmpty:
-                        #     _list.value = []
-                        for item in d[key]:
-                            o = self._structure[key][0].dataType.dataType()
-
-                            if hasattr(o, "loadDict"):
-                                o.loadDict(item)
-                                _list.append(o)
-                            else:
-                                _list.append(item)
-                        exec("self._content[key] = _list")
+class Validator(object):
+    """\
+    Validates a tree of DictBasedObjects in a single pass.
 
-                    else:
-                        self.set(key, d[key])
+    Cross-references (designer and license keywords, unique IDs) are checked against
+    symbol tables that are built once per InstallableFontsResponse or Foundry
+    instead of being looked up through the parent chain for each object.
+
+    Each object keeps the result of its last validation and a flag that is set when
+    it or one of its descendants changes. Unchanged subtrees are not walked again
+    unless the designer or license keywords they were checked against have changed.
+    Changes made in place inside dictionary values, such as Foundry.styling, go
+    unnoticed; assign the dictionary again instead.
+
+    level is one of VALIDATIONLEVELS and selects the checks that are made:
+
+    - STRUCTURAL: required attributes, cross-references, unique IDs and
+      contradictions that keep a response from being used, such as a desktop
+      font without .format or an asset with neither .data nor .dataURL
+    - STANDARD: additionally text lengths, HTML in texts, unknown Foundry.styling
+      themes and the recommendations that are returned as warnings
+    - EXHAUSTIVE: additionally Markdown in texts, font file name lengths
+      and the colors and logo URL in Foundry.styling
+
+    Overrides of customValidation() that take no level argument are called without it.
+
+    validate() returns information, warnings and critical errors as lists of
+    ValidationIssue objects.
+    """
+
+    def __init__(self, strict=True, level=EXHAUSTIVE):
+        if level not in VALIDATIONLEVELS:
+            raise ValueError("Unknown validation level '%s'. Known are %s." % (level, VALIDATIONLEVELS))
+        self.strict = strict
+        self.level = level
+
+    def validate(self, root):
+        self.response = None
+        self.foundry = None
+        self.symbols = {}
+
+        # Pick up the surrounding response and foundry when validating a subtree
+        node = getattr(root, "_parent", None)
+        while node is not None:
+            if self.response is None and isinstance(node, InstallableFontsResponse):
+                self.response = node
+            elif self.foundry is None and isinstance(node, Foundry):
+                self.foundry = node
+            node = getattr(node, "_parent", None)
+
+        information, warnings, critical = self.visit(root)
+        results = (list(information), list(warnings), list(critical))
+
+        # Only responses validate themselves at the top level
+        if isinstance(root, BaseResponse):
+            self.customValidation(root, ((root, None, None),), results)
+
+        return results
+
+    def visit(self, obj):
+        # Returns (information, warnings, critical) for obj and its descendants,
+        # with paths relative to obj. The lists may be cached and must not be changed.
+
+        response, foundry = self.response, self.foundry
+        if isinstance(obj, InstallableFontsResponse):
+            self.response = obj
+        elif isinstance(obj, Foundry):
+            self.foundry = obj
+
+        stamp = self.stamp()
+        cache = obj._validationCache
+        if obj._dirty or cache is None or cache[0] != stamp:
+            cache = (stamp, self.visitContent(obj))
+            obj._validationCache = cache
+            obj._dirty = False
+            DictBasedObject._cleanings += 1
+
+        self.response, self.foundry = response, foundry
+        return cache[1]
+
+    def stamp(self):
+        # What validation results depend on besides the object itself
+        return (
+            self.strict,
+            self.level,
+            self.designerKeywords(self.response) if self.response is not None else None,
+            self.licenseKeywords(self.foundry) if self.foundry is not None else None,
+        )
+
+    def visitContent(self, obj):
+
+        results = ([], [], [])
+
+        content = obj._content
+        for key, required, dataType, memberType in obj._validationPlan():
+
+            if key not in content:
+                # Frozen objects may be read by other threads at the same time, so they're
+                # left as they are. An unset key holds its default value, which is empty.
+                if obj._frozen:
+                    if self.strict and required and obj.discardThisKey(key) is False:
+                        results[2].append(ValidationIssue((), "requiredAttribute", (obj, key)))
+                    continue
+                obj.initAttr(key)
+
+            if obj.discardThisKey(key) is not False:
+                continue
+
+            if self.strict and required and obj._isEmptyKey(key):
+                results[2].append(ValidationIssue((), "requiredAttribute", (obj, key)))
+
+            elif memberType is None:
+                continue
+
+            elif issubclass(dataType, Proxy):
+                if obj._isEmptyKey(key) is False:
+                    value = getattr(obj, key)
+                    self.extend(results, self.visit(value), (obj, key, None))
+                    self.customValidation(value, ((obj, key, dataType.wrap(value)),), results)
+
+            elif not content[key].isEmpty():
+                for item in content[key]:
+                    self.extend(results, self.visit(item), (obj, key, None))
+                    self.customValidation(item, ((obj, key, item),), results)
+
+        return results
+
+    def extend(self, results, childResults, step):
+        for issues, childIssues in zip(results, childResults):
+            for issue in childIssues:
+                issues.append(ValidationIssue((step,) + issue.path, issue.code, issue.args))
+
+    def customValidation(self, obj, path, results):
+
+        information, warnings, critical = results
+
+        if hasattr(obj, "customValidation"):
+            if _takesLevel(type(obj).customValidation):
+                newInformation, newWarnings, newCritical = obj.customValidation(level=self.level)
+            else:
+                newInformation, newWarnings, newCritical = obj.customValidation()
+            for message in newInformation:
+                information.append(ValidationIssue(path, None, (message,)))
+            for message in newWarnings:
+                warnings.append(ValidationIssue(path, None, (message,)))
+            for message in newCritical:
+                critical.append(ValidationIssue(path, None, (message,)))
+
+        if isinstance(obj, (Font, Family)):
+            self.checkDesigners(obj.designerKeywords, self.response, path, critical)
+        elif isinstance(obj, LicenseUsage):
+            self.checkLicense(obj, self.foundry, path, critical)
+        elif isinstance(obj, InstallableFontsResponse):
+            self.checkUniqueIDs(obj, path, critical)
+
+    def designerKeywords(self, response):
+        if (response, "designers") not in self.symbols:
+            self.symbols[(response, "designers")] = frozenset(response._index()["designers"])
+        return self.symbols[(response, "designers")]
+
+    def licenseKeywords(self, foundry):
+        if (foundry, "licenses") not in self.symbols:
+            self.symbols[(foundry, "licenses")] = frozenset(foundry._index())
+        return self.symbols[(foundry, "licenses")]
+
+    def checkDesigners(self, designerKeywords, response, path, critical):
+        if designerKeywords and response is not None:
+            known = self.designerKeywords(response)
+            for designerKeyword in designerKeywords:
+                if designerKeyword not in known:
+                    critical.append(ValidationIssue(path, "unknownDesigner", (designerKeyword, response)))
+
+    def checkLicense(self, licenseUsage, foundry, path, critical):
+        if licenseUsage.keyword and foundry is not None and licenseUsage.keyword not in self.licenseKeywords(foundry):
+            critical.append(ValidationIssue(path, "unknownLicense", (licenseUsage.keyword, foundry)))
+
+    def fontIDs(self, family):
+        # Font uniqueIDs of a family, kept along with its validation result
+        cache = family.__dict__.get("_fontIDsCache")
+        if family._dirty or cache is None or cache[0] is not family._validationCache:
+            cache = (family._validationCache, [font.uniqueID for font in family.fonts])
+            family._fontIDsCache = cache
+        return cache[1]
+
+    def checkUniqueIDs(self, response, path, critical):
+
+        foundryIDs = []
+        familyIDs = []
+        fontIDs = []
+        for foundry in response.foundries:
+            foundryIDs.append(foundry.uniqueID)
+            for family in foundry.families:
+                familyIDs.append(family.uniqueID)
+                fontIDs.extend(self.fontIDs(family))
+
+        for code, IDs in (
+            ("duplicateFoundryIDs", foundryIDs),
+            ("duplicateFamilyIDs", familyIDs),
+            ("duplicateFontIDs", fontIDs),
+        ):
+            duplicates = [item for item, count in collections.Counter(IDs).items() if count > 1]
+            if duplicates:
+                critical.append(ValidationIssue(path, code, (duplicates,)))
+
+
+def _issueAsText(issue):
+    # Copy of a ValidationIssue with the objects in it replaced by their text, for handing it
+    # to another process. str() of the copy reads the same.
+    def text(value):
+        if value is None or isinstance(value, (str, int, float, list, tuple)):
+            return value
+        return str(value)
+
+    path = tuple((text(obj), key, text(sourceObject)) for obj, key, sourceObject in issue.path)
+    return ValidationIssue(path, issue.code, tuple(text(arg) for arg in issue.args))
 
-    def dumpJSON(self, strict=True, validate=False):
-        return json.dumps(self.dumpDict(strict=strict, validate=validate), indent=4, sort_keys=True)
 
-    def loadJSON(self, j):
-        self.loadDict(json.loads(j))
+# The InstallableFontsResponse in a ParallelValidator worker process
+_validationWorker = {}
+
+
+def _startValidationWorker(response):
+    # Pool initializer. response is the InstallableFontsResponse itself where the worker
+    # processes are forked, and its dumpSnapshot() where they are started afresh.
+    if isinstance(response, bytes):
+        snapshot = response
+        response = InstallableFontsResponse()
+        response.loadSnapshot(snapshot)
+    _validationWorker["response"] = response
+
+
+def _validateFamilies(strict, level, families):
+    # Worker task: validation results of the families at [(foundry index, family index)],
+    # with paths relative to each family
+    response = _validationWorker["response"]
+    validator = Validator(strict=strict, level=level)
+    validator.symbols = {}
+    results = []
+    for foundryIndex, familyIndex in families:
+        foundry = response.foundries[foundryIndex]
+        validator.response, validator.foundry = response, foundry
+        familyResults = validator.visit(foundry.families[familyIndex])
+        results.append(tuple([_issueAsText(issue) for issue in issues] for issues in familyResults))
+    return results
+
+
+class ParallelValidator(Validator):
+    """\
+    Validator for large catalogs that validates the families of an
+    InstallableFontsResponse, or of the one in a RootResponse, in a pool of worker
+    processes. The cross-references of each family are checked against the designer
+    and license keywords of the full catalog, and the results are merged in the order
+    that Validator would return them in.
+
+    Issues found by the workers carry their objects as text. Objects in this process
+    are left as they are, while Validator initializes the empty attributes that it checks.
+
+    processes is the number of worker processes, by default one per CPU core. As with
+    all uses of multiprocessing, scripts need an `if __name__ == "__main__":` guard on
+    platforms where worker processes are not forked.
+    """
+
+    def __init__(self, strict=True, processes=None, level=EXHAUSTIVE):
+        super().__init__(strict=strict, level=level)
+        self.processes = processes or os.cpu_count() or 1
+        self.familyResults = {}
+
+    def validate(self, root):
+        response = root
+        if isinstance(root, RootResponse) and "installableFonts" in root._content:
+            response = root.installableFonts
+        if isinstance(response, InstallableFontsResponse):
+            self.symbols = {}
+            self.familyResults = self.validateFamilies(response)
+        try:
+            return super().validate(root)
+        finally:
+            self.familyResults = {}
+
+    def validateFamilies(self, response):
+        # {id(family): (family, results)} for the families that visit() would validate anew
+        if response.discardThisKey("foundries") is not False:
+            return {}
+
+        pending = []
+        self.response = response
+        for foundryIndex, foundry in enumerate(response.foundries):
+            self.foundry = foundry
+            stamp = self.stamp()
+            for familyIndex, family in enumerate(foundry.families):
+                cache = family._validationCache
+                if family._dirty or cache is None or cache[0] != stamp:
+                    pending.append((foundryIndex, familyIndex, family))
+        self.response = self.foundry = None
+        if not pending:
+            return {}
+
+        size = max(1, len(pending) // (self.processes * 4))
+        chunks = [[(i, j) for i, j, family in pending[start : start + size]] for start in range(0, len(pending), size)]
+        if multiprocessing.get_start_method() != "fork":
+            response = response.dumpSnapshot()
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.processes, initializer=_startValidationWorker, initargs=(response,)
+        ) as executor:
+            results = []
+            for chunkResults in executor.map(
+                _validateFamilies, [self.strict] * len(chunks), [self.level] * len(chunks), chunks
+            ):
+                results.extend(chunkResults)
+
+        return {id(family): (family, result) for (i, j, family), result in zip(pending, results)}
+
+    def visit(self, obj):
+        if id(obj) in self.familyResults and self.familyResults[id(obj)][0] is obj:
+            results = self.familyResults[id(obj)][1]
+            obj._validationCache = (self.stamp(), results)
+            obj._dirty = False
+            DictBasedObject._cleanings += 1
+            return results
+        return super().visit(obj)
+
+
+class ValidationCache(object):
+    """\
+    Results of DictBasedObject.validate() kept on disk, for servers and tools that
+    validate the same responses over and over. Pass it to validate() as cache.
+
+    Results are stored by a digest of the object's fingerprint() together with its
+    class, the strict and level arguments and VERSION, as one file each in the
+    directory at path. When the files add up to more than maxSize bytes, the least
+    recently used ones are removed. Several processes may share the directory.
+    """
+
+    def __init__(self, path, maxSize=64 * 1024 * 1024):
+        self.path = path
+        self.maxSize = maxSize
+        os.makedirs(path, exist_ok=True)
+
+    def key(self, obj, strict, level):
+        return _digest([VERSION, obj.__class__.__name__, repr(strict), level, obj.fingerprint()])
+
+    def get(self, key):
+        # (information, warnings, critical) or None. Reading an entry marks it as used.
+        path = os.path.join(self.path, key + ".json")
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                information, warnings, critical = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return information, warnings, critical
+
+    def set(self, key, results):
+        # Written to a temporary file first, so that other processes never read half an entry
+        handle, temporary = tempfile.mkstemp(suffix=".tmp", dir=self.path)
+        with os.fdopen(handle, "w", encoding="utf-8") as f:
+            json.dump(results, f)
+        os.replace(temporary, os.path.join(self.path, key + ".json"))
+        self.evict()
+
+    def evict(self):
+        # Only runs after a validation, which takes much longer than listing the directory
+        entries = []
+        size = 0
+        for entry in os.scandir(self.path):
+            if entry.name.endswith(".json"):
+                try:
+                    stat = entry.stat()
+                except OSError:  # Removed by another process
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                size += stat.st_size
+
+        if size > self.maxSize:
+            for mtime, fileSize, path in sorted(entries):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                size -= fileSize
+                if size <= self.maxSize:
+                    break
 
 
 class Proxy(DataType):
@@ -1744,6 +3468,7 @@ Neither HTML nor Markdown code is permitted in `MultiLanguageText`.
         "zu",
     ]
     _dataType_for_possible_keys = StringDataType
+    _field_for_possible_keys = _LanguageField
     _length = 100
     _markdownAllowed = False
 
@@ -1766,23 +3491,18 @@ Neither HTML nor Markdown code is permitted in `MultiLanguageText`.
         """Like getText(), but additionally returns the language of whatever
         text was found first."""
 
-        if type(locale) == str:
-            if self.get(locale):
-                return self.get(locale), locale
-
-        elif type(locale) in (list, tuple):
-            for key in locale:
-                if self.get(key):
-                    return self.get(key), key
+        # _content only holds the languages that are set
+        content = self._content
 
-        # try english
-        if self.get("en"):
-            return self.get("en"), "en"
+        for key in _fallbackChain(locale):
+            text = content.get(key)
+            if text:
+                return text, key
 
         # try anything
-        for key in self._possible_keys:
-            if self.get(key):
-                return self.get(key), key
+        if content:
+            key = min(content, key=_languageOrder.get)
+            return content[key], key
 
         return None, None
 
@@ -1796,60 +3516,104 @@ Neither HTML nor Markdown code is permitted in `MultiLanguageText`.
 
         return text
 
-    def customValidation(self):
+    def customValidation(self, level=EXHAUSTIVE):
 
         information, warnings, critical = [], [], []
 
         if self.isEmpty():
             critical.append("Needs to contain at least one language field")
 
+        if level == STRUCTURAL:
+            return information, warnings, critical
+
         # Check for text length
-        for langId in self._possible_keys:
-            if self.get(langId):
-                string = self.get(langId)
+        for langId in sorted(self._content, key=_languageOrder.get):
+            string = self._content[langId]
+            if string:
                 if len(string) > self._length:
                     critical.append(
                         "Language entry '%s' is too long. Allowed are %s characters." % (langId, self._length)
                     )
 
-                if re.findall(r"(<.+?>)", string):
-                    if self._markdownAllowed:
-                        critical.append(
-                            (
-                                "String contains HTML code, which is not "
-                                "allowed. You may use Markdown for text "
-                                "formatting. String: " + string
-                            )
-                        )
-                    else:
-                        critical.append("String contains HTML code, which is not allowed. String: " + string)
-
-                if not self._markdownAllowed and string and "<p>" + string + "</p>\n" != markdown2.markdown(string):
-                    critical.append("String contains Markdown code, which is not allowed.")
+                # HTML is pre-screened for "<" and checked from STANDARD on,
+                # rendering the string to find Markdown only at EXHAUSTIVE
+                critical.extend(_markupIssues(string, self._markdownAllowed, level == EXHAUSTIVE))
 
         return information, warnings, critical
 
     def isSet(self):
-        for langId in self._possible_keys:
-            if langId in self._content and self.get(langId) not in (None, ""):
-                return True
-        return False
+        return bool(self._content)
 
     def isEmpty(self):
         return not self.isSet()
 
-    def loadDict(self, d):
+    def loadDict(self, d, lazy=False):
         for key in d:
             self.set(key, d[key])
 
 
+# Strings without any of these can't contain Markdown: markdown2 would render them
+# as a plain "<p>string</p>\n". Control and line break characters, double spaces,
+# leading or trailing whitespace and list or heading markers at the start are included.
+_markdownCharacters = re.compile(r"[\\`*_\[\]<>&#!|~{}]|[^\S ]|  |^[\s\-+=]|\s$|^\d+[.)]")
+
+
+@functools.lru_cache(maxsize=16384)
+def _markupIssues(string, markdownAllowed, checkMarkdown=True):
+    # HTML and, with checkMarkdown, Markdown checks of MultiLanguageText.customValidation()
+    # for one string. Memoized, as the same names and descriptions repeat across fonts and updates.
+    issues = []
+
+    if "<" in string and re.findall(r"(<.+?>)", string):
+        if markdownAllowed:
+            issues.append(
+                (
+                    "String contains HTML code, which is not "
+                    "allowed. You may use Markdown for text "
+                    "formatting. String: " + string
+                )
+            )
+        else:
+            issues.append("String contains HTML code, which is not allowed. String: " + string)
+
+    if (
+        checkMarkdown
+        and not markdownAllowed
+        and _markdownCharacters.search(string)
+        and "<p>" + string + "</p>\n" != markdown2.markdown(string)
+    ):
+        issues.append("String contains Markdown code, which is not allowed.")
+
+    return tuple(issues)
+
+
 def MultiLanguageText_Parent(self):
-    if hasattr(self, "_parent") and hasattr(self._parent, "_parent"):
-        return self._parent._parent
+    return _liveParent(self)
 
 
 MultiLanguageText.parent = property(lambda self: MultiLanguageText_Parent(self))
 
+# Position of each language in MultiLanguageText._possible_keys, for the "try anything" fallback
+_languageOrder = {key: i for i, key in enumerate(MultiLanguageText._possible_keys)}
+
+_fallbackChains = {}
+
+
+def _fallbackChain(locale):
+    # Languages that MultiLanguageText.getTextAndLocale() tries in turn, compiled once per locale list
+    cacheKey = tuple(locale) if type(locale) in (list, tuple) else locale
+    chain = _fallbackChains.get(cacheKey)
+    if chain is None:
+        chain = []
+        if type(locale) == str:
+            chain.append(locale)
+        elif type(locale) in (list, tuple):
+            chain.extend(locale)
+        chain.append("en")
+        chain = tuple(collections.OrderedDict.fromkeys(chain))
+        _fallbackChains[cacheKey] = chain
+    return chain
+
 
 class MultiLanguageTextProxy(Proxy):
     dataType = MultiLanguageText
@@ -2105,6 +3869,8 @@ class LicenseDefinition(DictBasedObject):
         ],
     }
 
+    _indexedKeys = ("keyword",)
+
     def __repr__(self):
         return "<LicenseDefinition '%s'>" % self.name or self.keyword or "undefined"
 
@@ -2118,8 +3884,7 @@ class LicenseDefinition(DictBasedObject):
 
 
 def LicenseDefinition_Parent(self):
-    if hasattr(self, "_parent") and hasattr(self._parent, "_parent") and hasattr(self._parent._parent, "_parent"):
-        return self._parent._parent._parent
+    return self._owner()
 
 
 LicenseDefinition.parent = property(lambda self: LicenseDefinition_Parent(self))
@@ -2309,27 +4074,15 @@ class LicenseUsage(DictBasedObject):
     def __repr__(self):
         return "<LicenseUsage '%s'>" % self.keyword or "undefined"
 
-    def customValidation(self):
-        information, warnings, critical = [], [], []
-
-        # Checking for existing license
-        if self.keyword and not self.getLicense():
-            critical.append(
-                "Has license '%s', but %s has no matching license." % (self.keyword, self.parent.parent.parent)
-            )
-
-        return information, warnings, critical
-
     def getLicense(self):
         """\
         Returns the ::License:: object that this font references.
         """
-        return self.parent.parent.parent.getLicenseByKeyword(self.keyword)
+        return self._ancestor(Foundry).getLicenseByKeyword(self.keyword)
 
 
 def LicenseUsage_Parent(self):
-    if hasattr(self, "_parent") and hasattr(self._parent, "_parent") and hasattr(self._parent._parent, "_parent"):
-        return self._parent._parent._parent
+    return self._owner()
 
 
 LicenseUsage.parent = property(lambda self: LicenseUsage_Parent(self))
@@ -2373,6 +4126,8 @@ class Designer(DictBasedObject):
         ],
     }
 
+    _indexedKeys = ("keyword",)
+
     def sample(self):
         o = self.__class__()
         o.keyword = "johndoe"
@@ -2385,8 +4140,7 @@ class Designer(DictBasedObject):
 
 
 def Designer_Parent(self):
-    if hasattr(self, "_parent") and hasattr(self._parent, "_parent") and hasattr(self._parent._parent, "_parent"):
-        return self._parent._parent._parent
+    return self._owner()
 
 
 Designer.parent = property(lambda self: Designer_Parent(self))
@@ -2454,8 +4208,7 @@ class Version(DictBasedObject):
 
 
 def Version_Parent(self):
-    if hasattr(self, "_parent") and hasattr(self._parent, "_parent") and hasattr(self._parent._parent, "_parent"):
-        return self._parent._parent._parent
+    return self._owner()
 
 
 Version.parent = property(lambda self: Version_Parent(self))
@@ -2670,6 +4423,8 @@ class Font(DictBasedObject):
         # ],
     }
 
+    _indexedKeys = ("uniqueID",)
+
     def __repr__(self):
         return "<Font '%s'>" % (self.postScriptName or self.name.getText() or "undefined")
 
@@ -2701,7 +4456,7 @@ class Font(DictBasedObject):
     def hasVersionInformation(self):
         return self.versions or self.parent.versions
 
-    def customValidation(self):
+    def customValidation(self, level=EXHAUSTIVE):
         information, warnings, critical = [], [], []
 
         # Checking font type/extension
@@ -2715,14 +4470,6 @@ class Font(DictBasedObject):
                 "Either one needs to carry version information." % (self.parent)
             )
 
-        # Checking for designers
-        for designerKeyword in self.designerKeywords:
-            if not self.parent.parent.parent.getDesignerByKeyword(designerKeyword):
-                critical.append(
-                    "Has designer '%s', but %s.designers has no matching designer."
-                    % (designerKeyword, self.parent.parent.parent)
-                )
-
         # Checking uniqueID for file name contradictions:
         forbidden = "/?<>\\:*|^,;"
         for char in forbidden:
@@ -2732,10 +4479,11 @@ class Font(DictBasedObject):
                     "be used for the font’s file name on disk." % char
                 )
 
-        for version in self.getVersions():
-            filename = self.filename(version.number)
-            if len(filename) > 220:
-                critical.append("The suggested file name is longer than 220 characters: %s" % filename)
+        if level == EXHAUSTIVE:
+            for version in self.getVersions():
+                filename = self.filename(version.number)
+                if len(filename) > 220:
+                    critical.append("The suggested file name is longer than 220 characters: %s" % filename)
 
         return information, warnings, critical
 
@@ -2762,23 +4510,29 @@ class Font(DictBasedObject):
                 "Either one needs to carry version information." % (self, self.parent)
             )
 
-        def compare(a, b):
-            return semver.VersionInfo.parse(makeSemVer(a.number)).compare(makeSemVer(b.number))
-            # return semver.compare(makeSemVer(a.number), makeSemVer(b.number))
-
-        versions = []
-        haveVersionNumbers = []
-        for version in self.versions:
-            versions.append(version)
-            haveVersionNumbers.append(makeSemVer(version.number))
-        for version in self.parent.versions:
-            if version.number not in haveVersionNumbers:
+        # The merged timeline is kept until a version of this font or its family
+        # is added, removed, replaced or renumbered
+        fontVersions = [(version, version.number) for version in self.versions]
+        familyVersions = [(version, version.number) for version in self.parent.versions]
+        stamp = [(id(version), number) for version, number in fontVersions + familyVersions]
+
+        cache = self.__dict__.get("_versionTimeline")
+        if cache is None or cache[0] != stamp:
+            versions = []
+            haveVersionNumbers = []
+            for version, number in fontVersions:
                 versions.append(version)
-                haveVersionNumbers.append(makeSemVer(version.number))
+                haveVersionNumbers.append(makeSemVer(number))
+            for version, number in familyVersions:
+                if number not in haveVersionNumbers:
+                    versions.append(version)
+                    haveVersionNumbers.append(makeSemVer(number))
 
-        versions = sorted(versions, key=functools.cmp_to_key(compare))
+            versions.sort(key=lambda version: parseSemVer(version.number))
+            cache = (stamp, versions)
+            self._versionTimeline = cache
 
-        return versions
+        return list(cache[1])
 
     def getDesigners(self):
         """\
@@ -2788,20 +4542,35 @@ class Font(DictBasedObject):
         Please read the section about [versioning](#versioning) above.
         """
         if not hasattr(self, "_designers"):
-            self._designers = []
+            # Built up before it's kept, as frozen fonts may be read by several threads
+            designers = []
+            response = self._ancestor(InstallableFontsResponse)
 
             # Family level designers
             if self.parent.designerKeywords:
                 for designerKeyword in self.parent.designerKeywords:
-                    self._designers.append(self.parent.parent.parent.getDesignerByKeyword(designerKeyword))
+                    designers.append(response.getDesignerByKeyword(designerKeyword))
 
             # Font level designers
             if self.designerKeywords:
                 for designerKeyword in self.designerKeywords:
-                    self._designers.append(self.parent.parent.parent.getDesignerByKeyword(designerKeyword))
+                    designers.append(response.getDesignerByKeyword(designerKeyword))
+
+            self._designers = designers
 
         return self._designers
 
+    def _deriveFrozen(self):
+        # Builds the lists that getVersions() and getDesigners() return for freeze()
+        if self.parent is None:
+            return
+        try:
+            self.getVersions()
+        except ValueError:  # No or invalid version information, raised again when used
+            pass
+        if self._ancestor(InstallableFontsResponse) is not None:
+            self.getDesigners()
+
     def getPackageKeywords(self):
         if self.packageKeywords:
             return list(set(self.packageKeywords))
@@ -2810,8 +4579,7 @@ class Font(DictBasedObject):
 
 
 def Font_Parent(self):
-    if hasattr(self, "_parent") and hasattr(self._parent, "_parent") and hasattr(self._parent._parent, "_parent"):
-        return self._parent._parent._parent
+    return self._owner()
 
 
 Font.parent = property(lambda self: Font_Parent(self))
@@ -2933,6 +4701,9 @@ class Family(DictBasedObject):
         ],
     }
 
+    _indexedKeys = ("uniqueID", "fonts")
+    _streamedKeys = ("fonts",)
+
     def sample(self):
         o = self.__class__()
         o.name.en = "Awesome Family"
@@ -2944,24 +4715,10 @@ class Family(DictBasedObject):
     def __repr__(self):
         return "<Family '%s'>" % self.name.getText() or "undefined"
 
-    def customValidation(self):
-        information, warnings, critical = [], [], []
-
-        # Checking for designers
-        for designerKeyword in self.designerKeywords:
-            if not self.parent.parent.getDesignerByKeyword(designerKeyword):
-                critical.append(
-                    "Has designer '%s', but %s.designers has no matching designer."
-                    % (designerKeyword, self.parent.parent)
-                )
-
-        return information, warnings, critical
-
     def getDesigners(self):
         if not hasattr(self, "_designers"):
-            self._designers = []
-            for designerKeyword in self.designerKeywords:
-                self._designers.append(self.parent.parent.getDesignerByKeyword(designerKeyword))
+            response = self._ancestor(InstallableFontsResponse)
+            self._designers = [response.getDesignerByKeyword(keyword) for keyword in self.designerKeywords]
         return self._designers
 
     def getAllDesigners(self):
@@ -2972,18 +4729,27 @@ class Family(DictBasedObject):
         one-glance overview of all designers involved.
         """
         if not hasattr(self, "_allDesigners"):
-            self._allDesigners = []
-            self._allDesignersKeywords = []
+            # Built up before it's kept, as frozen families may be read by several threads
+            allDesigners = []
+            allDesignersKeywords = []
+            response = self._ancestor(InstallableFontsResponse)
             for designerKeyword in self.designerKeywords:
-                self._allDesigners.append(self.parent.parent.getDesignerByKeyword(designerKeyword))
-                self._allDesignersKeywords.append(designerKeyword)
+                allDesigners.append(response.getDesignerByKeyword(designerKeyword))
+                allDesignersKeywords.append(designerKeyword)
             for font in self.fonts:
                 for designerKeyword in font.designerKeywords:
-                    if designerKeyword not in self._allDesignersKeywords:
-                        self._allDesigners.append(self.parent.parent.getDesignerByKeyword(designerKeyword))
-                        self._allDesignersKeywords.append(designerKeyword)
+                    if designerKeyword not in allDesignersKeywords:
+                        allDesigners.append(response.getDesignerByKeyword(designerKeyword))
+                        allDesignersKeywords.append(designerKeyword)
+            self._allDesigners = allDesigners
         return self._allDesigners
 
+    def _deriveFrozen(self):
+        # Builds the lists that getDesigners() and getAllDesigners() return for freeze()
+        if self._ancestor(InstallableFontsResponse) is not None:
+            self.getDesigners()
+            self.getAllDesigners()
+
     def getPackages(self, filterByFontPurpose=[]):
 
         packageKeywords = []
@@ -3029,8 +4795,7 @@ class Family(DictBasedObject):
 
 
 def Family_Parent(self):
-    if hasattr(self, "_parent") and hasattr(self._parent, "_parent") and hasattr(self._parent._parent, "_parent"):
-        return self._parent._parent._parent
+    return self._owner()
 
 
 Family.parent = property(lambda self: Family_Parent(self))
@@ -3182,6 +4947,9 @@ class Foundry(DictBasedObject):
         ],
     }
 
+    _indexedKeys = ("uniqueID", "families", "licenses")
+    _streamedKeys = ("families",)
+
     _stylingColorAttributes = (
         "headerColor",
         "headerTextColor",
@@ -3211,25 +4979,29 @@ class Foundry(DictBasedObject):
     def __repr__(self):
         return "<Foundry '%s'>" % self.name.getText() or "undefined"
 
-    def getLicenseByKeyword(self, keyword):
-        if not hasattr(self, "_licensesDict"):
-            self._licensesDict = {}
-            for license in self.licenses:
-                self._licensesDict[license.keyword] = license
+    def _index(self):
+        # {keyword: LicenseDefinition}, rebuilt after licenses change
+        if self._indexes is None:
+            self._indexes = {license.keyword: license for license in self.licenses}
+            DictBasedObject._cleanings += 1
+        return self._indexes
 
-        if keyword in self._licensesDict:
-            return self._licensesDict[keyword]
+    def getLicenseByKeyword(self, keyword):
+        return self._index().get(keyword)
 
-    def customValidation(self):
+    def customValidation(self, level=EXHAUSTIVE):
         information, warnings, critical = [], [], []
 
         themes = ["light", "dark"]
 
-        if self.styling:
+        if self.styling and level != STRUCTURAL:
             for theme in self.styling:
                 if theme not in themes:
                     critical.append("Styling keyword '%s' is unknown. Known are %s." % (theme, themes))
 
+                if level != EXHAUSTIVE:
+                    continue
+
                 for colorKey in self._stylingColorAttributes:
                     if colorKey in self.styling[theme]:
 
@@ -3250,8 +5022,7 @@ class Foundry(DictBasedObject):
 
 
 def Foundry_Parent(self):
-    if hasattr(self, "_parent") and hasattr(self._parent, "_parent") and hasattr(self._parent._parent, "_parent"):
-        return self._parent._parent._parent
+    return self._owner()
 
 
 Foundry.parent = property(lambda self: Foundry_Parent(self))
@@ -3283,7 +5054,7 @@ class BaseResponse(DictBasedObject):
     def __repr__(self):
         return "<%s>" % self.__class__.__name__
 
-    def customValidation(self):
+    def customValidation(self, level=EXHAUSTIVE):
         information, warnings, critical = [], [], []
 
         if hasattr(self, "response") and self.response == ERROR and self.errorMessage.isEmpty():
@@ -3311,6 +5082,74 @@ class InstallableFontsResponseType(ResponseCommandDataType):
             )
 
 
+class ContentChanges(object):
+    """\
+    Changes between two versions of an InstallableFontsResponse,
+    as returned by InstallableFontsResponse.getDetailedContentChanges().
+    All lists hold uniqueIDs.
+    """
+
+    def __init__(self):
+        self.overallChanges = False
+        self.addedFoundries = []
+        self.removedFoundries = []
+        self.addedFamilies = []
+        self.removedFamilies = []
+        self.addedFonts = []
+        self.removedFonts = []
+        self.fontsWithAddedVersions = []
+
+        # {(level, uniqueID): [key, ...]} of foundries, families and fonts present in both
+        # versions, with level being "foundries", "families" or "fonts", as uniqueIDs are
+        # only unique per level. A foundry's families and a family's fonts are reported
+        # under their own entries.
+        self.changedKeys = {}
+
+    def __repr__(self):
+        return "<ContentChanges %s>" % self.summary()
+
+    def summary(self, calculateOverallChanges=True):
+        # Counts as returned by InstallableFontsResponse.getContentChanges()
+        comparison = {}
+
+        if self.addedFonts:
+            comparison["addedFonts"] = len(self.addedFonts)
+            comparison["overallChanges"] = True
+
+        if self.removedFonts:
+            comparison["removedFonts"] = len(self.removedFonts)
+            comparison["overallChanges"] = True
+
+        if self.fontsWithAddedVersions:
+            comparison["fontsWithAddedVersions"] = len(self.fontsWithAddedVersions)
+            comparison["overallChanges"] = True
+
+        # Other content changes (including the above ones)
+        if calculateOverallChanges and self.overallChanges:
+            comparison["overallChanges"] = True
+
+        return comparison
+
+
+def _changedKeys(old, new):
+    # Keys whose content differs between two versions of a Foundry, Family or Font
+    if old.fingerprint() == new.fingerprint():
+        return []
+    oldContent = dict(old._serializedContent())
+    newContent = dict(new._serializedContent())
+    keys = []
+    for key in sorted(set(oldContent) | set(newContent)):
+        if key in ("families", "fonts") and not isinstance(new, Font):
+            continue
+        if (
+            key not in oldContent
+            or key not in newContent
+            or _fingerprintMember(oldContent[key]) != _fingerprintMember(newContent[key])
+        ):
+            keys.append(key)
+    return keys
+
+
 class InstallableFontsResponse(BaseResponse):
     """\
     This is the response expected to be returned when the API is invoked using the
@@ -3402,55 +5241,84 @@ class InstallableFontsResponse(BaseResponse):
         ],
     }
 
-    def getFontByUniqueID(self, ID):
-        for foundry in self.foundries:
-            for family in foundry.families:
-                for font in family.fonts:
-                    if font.uniqueID == ID:
-                        return font
+    _indexedKeys = ("foundries", "designers")
+    _streamedKeys = ("foundries",)
+
+    def _index(self):
+        # Lookup tables for the get...By...() methods, rebuilt after a uniqueID,
+        # keyword or one of the lists involved changes (see DictBasedObject._changed())
+        if self._indexes is None:
+            foundries, families, fonts = {}, {}, {}
+            for foundry in self.foundries:
+                foundries.setdefault(foundry.uniqueID, foundry)
+                for family in foundry.families:
+                    families.setdefault(family.uniqueID, family)
+                    for font in family.fonts:
+                        fonts.setdefault(font.uniqueID, font)
+            self._indexes = {
+                "foundries": foundries,
+                "families": families,
+                "fonts": fonts,
+                "designers": {designer.keyword: designer for designer in self.designers},
+            }
+            DictBasedObject._cleanings += 1
+        return self._indexes
 
-    def getContentChanges(self, other, calculateOverallChanges=True):
-        comparison = {}
-        oldFonts = []
-        newFonts = []
-        newVersions = 0
+    def getFontByUniqueID(self, ID):
+        return self._index()["fonts"].get(ID)
 
-        # Accumulate old and new fonts
-        for foundry in self.foundries:
-            for family in foundry.families:
-                for font in family.fonts:
-                    oldFonts.append(font.uniqueID)
-        for foundry in other.foundries:
-            for family in foundry.families:
-                for font in family.fonts:
-                    newFonts.append(font.uniqueID)
-                    # Versions
-                    oldFont = self.getFontByUniqueID(font.uniqueID)
-                    if oldFont and len(font.getVersions()) > len(oldFont.getVersions()):
-                        newVersions += 1
-
-        # Added or removed fonts
-        addedFonts = set(newFonts) - set(oldFonts)
-        if addedFonts:
-            comparison["addedFonts"] = len(addedFonts)
-            comparison["overallChanges"] = True
+    def getFamilyByUniqueID(self, ID):
+        return self._index()["families"].get(ID)
 
-        removedFonts = set(oldFonts) - set(newFonts)
-        if removedFonts:
-            comparison["removedFonts"] = len(removedFonts)
-            comparison["overallChanges"] = True
+    def getFoundryByUniqueID(self, ID):
+        return self._index()["foundries"].get(ID)
 
-        if newVersions:
-            comparison["fontsWithAddedVersions"] = newVersions
-            comparison["overallChanges"] = True
+    def getContentChanges(self, other, calculateOverallChanges=True):
+        return self.getDetailedContentChanges(other).summary(calculateOverallChanges=calculateOverallChanges)
 
-        # Other content changes (including the above ones)
-        if calculateOverallChanges:
-            identical = self.sameContent(other)
-            if not identical:
-                comparison["overallChanges"] = True
+    def getDetailedContentChanges(self, other):
+        """\
+        Compares this response to a newer version of it, `other`, and returns a
+        ContentChanges object listing added and removed foundries, families and fonts,
+        fonts with new versions and the changed keys per level and uniqueID.
+        """
 
-        return comparison
+        changes = ContentChanges()
+        changes.overallChanges = self.fingerprint() != other.fingerprint()
+        if not changes.overallChanges:
+            return changes
+
+        old, new = self._index(), other._index()
+
+        for level in ("foundries", "families", "fonts"):
+            oldObjects, newObjects = old[level], new[level]
+            setattr(changes, "added" + level.capitalize(), [ID for ID in newObjects if ID not in oldObjects])
+            setattr(changes, "removed" + level.capitalize(), [ID for ID in oldObjects if ID not in newObjects])
+
+            for ID in newObjects:
+                if ID in oldObjects:
+                    keys = _changedKeys(oldObjects[ID], newObjects[ID])
+                    if keys:
+                        changes.changedKeys[(level, ID)] = keys
+
+        # getVersions() merges font and family versions, so only parse those of fonts
+        # where either changed
+        changedFamilyVersions = {}
+        for ID, font in new["fonts"].items():
+            oldFont = old["fonts"].get(ID)
+            if oldFont is None:
+                continue
+            family, oldFamily = font.parent, oldFont.parent
+            pair = (id(oldFamily), id(family))
+            if pair not in changedFamilyVersions:
+                changedFamilyVersions[pair] = oldFamily.fingerprint() != family.fingerprint() and _fingerprintMember(
+                    oldFamily.versions
+                ) != _fingerprintMember(family.versions)
+            if changedFamilyVersions[pair] or "versions" in changes.changedKeys.get(("fonts", ID), ()):
+                if len(font.getVersions()) > len(oldFont.getVersions()):
+                    changes.fontsWithAddedVersions.append(ID)
+
+        return changes
 
     def sample(self):
         o = self.__class__()
@@ -3458,13 +5326,7 @@ class InstallableFontsResponse(BaseResponse):
         return o
 
     def getDesignerByKeyword(self, keyword):
-        if not hasattr(self, "_designersDict"):
-            self._designersDict = {}
-            for designer in self.designers:
-                self._designersDict[designer.keyword] = designer
-
-        if keyword in self._designersDict:
-            return self._designersDict[keyword]
+        return self._index()["designers"].get(keyword)
 
     def discardThisKey(self, key):
 
@@ -3473,13 +5335,13 @@ class InstallableFontsResponse(BaseResponse):
 
         return False
 
-    def customValidation(self):
+    def customValidation(self, level=EXHAUSTIVE):
         information, warnings, critical = [], [], []
 
         if hasattr(self, "response") and self.response == ERROR and self.errorMessage.isEmpty():
             critical.append(f".response is '{ERROR}', but .errorMessage is missing.")
 
-        if self.response == "success" and not self.name.getText():
+        if level != STRUCTURAL and self.response == "success" and not self.name.getText():
             warnings.append(
                 "The response has no .name value. It is not required, but highly "
                 "recommended, to describe the purpose of this subscription to the "
@@ -3488,32 +5350,9 @@ class InstallableFontsResponse(BaseResponse):
                 "to the same user."
             )
 
-        # Check all uniqueIDs for duplicity
-        foundryIDs = []
-        familyIDs = []
-        fontIDs = []
-        for foundry in self.foundries:
-            foundryIDs.append(foundry.uniqueID)
-            for family in foundry.families:
-                familyIDs.append(family.uniqueID)
-                for font in family.fonts:
-                    fontIDs.append(font.uniqueID)
+        # Unique IDs and designer/license references are checked by Validator
 
-        import collections
-
-        duplicateFoundryIDs = [item for item, count in list(collections.Counter(foundryIDs).items()) if count > 1]
-        if duplicateFoundryIDs:
-            critical.append("Duplicate unique foundry IDs: %s" % duplicateFoundryIDs)
-
-        duplicateFamilyIDs = [item for item, count in list(collections.Counter(familyIDs).items()) if count > 1]
-        if duplicateFamilyIDs:
-            critical.append("Duplicate unique family IDs: %s" % duplicateFamilyIDs)
-
-        duplicateFontIDs = [item for item, count in list(collections.Counter(fontIDs).items()) if count > 1]
-        if duplicateFontIDs:
-            critical.append("Duplicate unique family IDs: %s" % duplicateFontIDs)
-
-        newInformation, newWarnings, newCritical = super().customValidation()
+        newInformation, newWarnings, newCritical = super().customValidation(level=level)
         if newInformation:
             information.extend(newInformation)
         if newWarnings:
@@ -3621,7 +5460,7 @@ class InstallFontAsset(BaseResponse):
         o.version = "1.1"
         return o
 
-    def customValidation(self):
+    def customValidation(self, level=EXHAUSTIVE):
 
         information, warnings, critical = [], [], []
 
@@ -3643,7 +5482,7 @@ class InstallFontAsset(BaseResponse):
         if self.response == ERROR and self.errorMessage.isEmpty():
             critical.append(".response is '%s', but .errorMessage is missing." % (ERROR))
 
-        newInformation, newWarnings, newCritical = super().customValidation()
+        newInformation, newWarnings, newCritical = super().customValidation(level=level)
         if newInformation:
             information.extend(newInformation)
         if newWarnings:
@@ -4012,10 +5851,10 @@ data, and whether or not this endpoint can be publicized about.
         o.public = True
         return o
 
-    def customValidation(self):
+    def customValidation(self, level=EXHAUSTIVE):
         information, warnings, critical = [], [], []
 
-        if self.canonicalURL and not self.canonicalURL.startswith("https://"):
+        if level != STRUCTURAL and self.canonicalURL and not self.canonicalURL.startswith("https://"):
             warnings.append(".canonicalURL is not using SSL (https://). Consider using SSL to protect your data.")
 
         if self.public:
@@ -4100,6 +5939,8 @@ class RootResponse(BaseResponse):
         ],
     }
 
+    _streamedKeys = ("installableFonts",)
+
     def sample(self):
         o = self.__class__()
         o.endpoint = EndpointResponse().sample()
@@ -0,0 +1,611 @@
+# -*- coding: utf-8 -*-
+
+import copy
+import gc
+import os
+import sys
+import tempfile
+import timeit
+import tracemalloc
+
+# Use local code for local testing, and rely on system-installed module for CI-testing
+CI = os.getenv("CI", "false").lower() != "false"
+if not CI:
+    path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+import typeworld.api  # noqa: E402
+
+
+def makeCatalog(families=20, fonts=50):
+    """\
+    Build an InstallableFontsResponse with one foundry and families * fonts fonts.
+    """
+
+    designer = typeworld.api.Designer()
+    designer.keyword = "designer"
+    designer.name.en = "Designer"
+
+    license = typeworld.api.LicenseDefinition()
+    license.keyword = "eula"
+    license.name.en = "EULA"
+    license.URL = "https://type.world/eula"
+
+    foundry = typeworld.api.Foundry()
+    foundry.uniqueID = "foundry"
+    foundry.name.en = "Foundry"
+    foundry.licenses.append(license)
+
+    for i in range(families):
+        family = typeworld.api.Family()
+        family.uniqueID = "family%s" % i
+        family.name.en = "Family %s" % i
+        version = typeworld.api.Version()
+        version.number = "1.0"
+        family.versions.append(version)
+
+        for j in range(fonts):
+            font = typeworld.api.Font()
+            font.uniqueID = "family%s-font%s" % (i, j)
+            font.postScriptName = "Family%s-Font%s" % (i, j)
+            font.name.en = "Font %s" % j
+            font.purpose = "desktop"
+            font.format = "otf"
+            font.designerKeywords = ["designer"]
+            usedLicense = typeworld.api.LicenseUsage()
+            usedLicense.keyword = "eula"
+            font.usedLicenses.append(usedLicense)
+            family.fonts.append(font)
+
+        foundry.families.append(family)
+
+    installableFonts = typeworld.api.InstallableFontsResponse()
+    installableFonts.response = "success"
+    installableFonts.designers.append(designer)
+    installableFonts.foundries.append(foundry)
+
+    return installableFonts
+
+
+def report(label, seconds, number):
+    print("%-40s %8.1f ns" % (label, seconds / number * 1e9))
+
+
+def attributeAccess(number=1000000):
+    """\
+    Cost of a single attribute read and write on a DictBasedObject.
+    """
+
+    font = typeworld.api.Font()
+    font.uniqueID = "font"
+    mlt = typeworld.api.MultiLanguageText()
+    mlt.en = "Text"
+
+    report("read font.uniqueID", timeit.timeit(lambda: font.uniqueID, number=number), number)
+    report("write font.uniqueID", timeit.timeit(lambda: setattr(font, "uniqueID", "font"), number=number), number)
+    report("read font.usedLicenses (list)", timeit.timeit(lambda: font.usedLicenses, number=number), number)
+    report("read mlt.en", timeit.timeit(lambda: mlt.en, number=number), number)
+    report("write mlt.en", timeit.timeit(lambda: setattr(mlt, "en", "Text"), number=number), number)
+
+    catalog = makeCatalog()
+    usedLicense = catalog.foundries[0].families[3].fonts[7].usedLicenses[0]
+    report(
+        "write seatsInstalled in a catalog",
+        timeit.timeit(lambda: setattr(usedLicense, "seatsInstalled", 1), number=number),
+        number,
+    )
+
+    # Copies of other catalogs don't slow down changes in this one
+    other = makeCatalog(families=2, fonts=2)
+    otherCopy = copy.deepcopy(other)  # noqa: F841
+    report(
+        "write seatsInstalled, other copy alive",
+        timeit.timeit(lambda: setattr(usedLicense, "seatsInstalled", 1), number=number),
+        number,
+    )
+
+
+def catalogScan(number=20):
+    """\
+    Walk all fonts of a catalog reading uniqueIDs, like APISubscription.installedFonts() does.
+    """
+
+    installableFonts = makeCatalog()
+
+    def scan():
+        for foundry in installableFonts.foundries:
+            for family in foundry.families:
+                for font in family.fonts:
+                    font.uniqueID
+
+    fonts = sum(len(family.fonts) for family in installableFonts.foundries[0].families)
+    report("catalog scan, per font", timeit.timeit(scan, number=number), number * fonts)
+
+
+def validation(number=3):
+    """\
+    Validate a whole catalog, like readJSONResponse() does for each subscription update.
+    """
+
+    installableFonts = makeCatalog(families=50, fonts=100)
+    root = typeworld.api.RootResponse()
+    root.installableFonts = installableFonts
+
+    fonts = sum(len(family.fonts) for family in installableFonts.foundries[0].families)
+    report("validate, per font", timeit.timeit(root.validate, number=1), fonts)
+    report("validate unchanged", timeit.timeit(root.validate, number=number), number)
+
+    # Publisher-side pattern: change one license usage, validate again
+    usedLicense = installableFonts.foundries[0].families[0].fonts[0].usedLicenses[0]
+
+    def revalidate():
+        usedLicense.seatsInstalled = 1
+        root.validate()
+
+    report("validate after one change", timeit.timeit(revalidate, number=number), number)
+
+
+def validationLevels():
+    """\
+    Validate a new catalog at each validation level, like readJSONResponse() does for an
+    update that changes all fonts.
+    """
+
+    for level in typeworld.api.VALIDATIONLEVELS:
+        root = typeworld.api.RootResponse()
+        root.installableFonts = makeCatalog(families=50, fonts=100)
+        typeworld.api._markupIssues.cache_clear()
+        fonts = sum(len(family.fonts) for family in root.installableFonts.foundries[0].families)
+        report("validate %s, per font" % level, timeit.timeit(lambda: root.validate(level=level), number=1), fonts)
+
+
+def serialization(number=3):
+    """\
+    Dump a catalog to JSON, like TypeWorldProtocol.save() does on each subscription change.
+    """
+
+    installableFonts = makeCatalog(families=50, fonts=100)
+
+    report("dumpJSON", timeit.timeit(installableFonts.dumpJSON, number=number), number)
+    report(
+        "dumpJSON(compact=True)",
+        timeit.timeit(lambda: installableFonts.dumpJSON(compact=True), number=number),
+        number,
+    )
+    installableFonts.validate()
+    report(
+        "dumpJSON(validate=True)",
+        timeit.timeit(lambda: installableFonts.dumpJSON(validate=True), number=number),
+        number,
+    )
+
+
+def comparison(number=3):
+    """\
+    Compare two catalogs, like getContentChanges() does on each subscription update.
+    """
+
+    installableFonts = makeCatalog(families=50, fonts=100)
+    other = makeCatalog(families=50, fonts=100)
+
+    report("sameContent, first", timeit.timeit(lambda: installableFonts.sameContent(other), number=1), 1)
+    report("sameContent, again", timeit.timeit(lambda: installableFonts.sameContent(other), number=number), number)
+
+    usedLicense = other.foundries[0].families[0].fonts[0].usedLicenses[0]
+
+    def compareAfterChange():
+        usedLicense.seatsInstalled = 1
+        installableFonts.sameContent(other)
+
+    report("sameContent after one change", timeit.timeit(compareAfterChange, number=number), number)
+
+
+def lookups():
+    """\
+    Look up every font by its uniqueID, like installFonts() does for a bulk installation.
+    """
+
+    installableFonts = makeCatalog(families=50, fonts=100)
+    IDs = [font.uniqueID for family in installableFonts.foundries[0].families for font in family.fonts]
+
+    def lookUp():
+        for ID in IDs:
+            installableFonts.getFontByUniqueID(ID)
+
+    report("getFontByUniqueID, 5000 fonts", timeit.timeit(lookUp, number=1), 1)
+
+
+def contentChanges(number=3):
+    """\
+    Diff a catalog against an update with one added font and one added family version,
+    like a subscription update does.
+    """
+
+    installableFonts = makeCatalog(families=50, fonts=100)
+    other = makeCatalog(families=50, fonts=100)
+
+    family = other.foundries[0].families[1]
+    font = typeworld.api.Font()
+    font.uniqueID = "added"
+    font.postScriptName = "Added"
+    font.name.en = "Added"
+    font.purpose = "desktop"
+    font.format = "otf"
+    family.fonts.append(font)
+    version = typeworld.api.Version()
+    version.number = "1.1"
+    other.foundries[0].families[2].versions.append(version)
+
+    report(
+        "getContentChanges, 5000 fonts, first",
+        timeit.timeit(lambda: installableFonts.getContentChanges(other), number=1),
+        1,
+    )
+    report(
+        "getContentChanges, 5000 fonts, again",
+        timeit.timeit(lambda: installableFonts.getContentChanges(other), number=number),
+        number,
+    )
+
+
+def versions(number=3):
+    """\
+    Get the latest version of every font, like outdatedFonts() does for its badges.
+    """
+
+    installableFonts = makeCatalog(families=50, fonts=100)
+    for family in installableFonts.foundries[0].families:
+        for versionNumber in ("1.1", "1.10", "2.0.0-beta.1", "2.0"):
+            version = typeworld.api.Version()
+            version.number = versionNumber
+            family.versions.append(version)
+    fonts = [font for family in installableFonts.foundries[0].families for font in family.fonts]
+
+    def latestVersions():
+        for font in fonts:
+            font.getVersions()[-1]
+
+    report("getVersions, 5000 fonts, first", timeit.timeit(latestVersions, number=1), 1)
+    report("getVersions, 5000 fonts, again", timeit.timeit(latestVersions, number=number), number)
+
+
+def texts(number=3):
+    """\
+    Get the name of every font for a German user interface, like a font list does.
+    """
+
+    installableFonts = makeCatalog(families=50, fonts=100)
+    fonts = [font for family in installableFonts.foundries[0].families for font in family.fonts]
+
+    def names():
+        for font in fonts:
+            font.name.getText(["de", "fr"])
+
+    report("getText, 5000 fonts", timeit.timeit(names, number=number), number)
+
+
+def textValidation():
+    """\
+    Validate 5000 names, then 5000 new texts with the same names, like the next update does.
+    """
+
+    def validate(name):
+        for i in range(5000):
+            text = typeworld.api.MultiLanguageText()
+            text.en = name % i
+            text.customValidation()
+
+    for name in ("Font Family %s, Semi-Bold Condensed (1.0)", "Font Family %s, Black & White"):
+        report("validate 5000 names '%s'" % name[12:], timeit.timeit(lambda: validate(name), number=1), 1)
+        report("  again", timeit.timeit(lambda: validate(name), number=1), 1)
+
+
+def streamingLoad():
+    """\
+    Load a catalog from a response body in one piece and in 64 KB chunks, like readJSONResponse() does.
+    Peak memory includes the response body.
+    """
+
+    root = typeworld.api.RootResponse()
+    root.installableFonts = makeCatalog(families=50, fonts=100)
+    data = root.dumpJSON(compact=True).encode()
+    del root
+
+    def loadJSON():
+        typeworld.api.RootResponse().loadJSON(data.decode())
+
+    def loadJSONChunks():
+        chunks = (data[i : i + 65536] for i in range(0, len(data), 65536))
+        typeworld.api.RootResponse().loadJSONChunks(chunks)
+
+    for function in (loadJSON, loadJSONChunks):
+        tracemalloc.start()
+        duration = timeit.timeit(function, number=1)
+        peak = tracemalloc.get_traced_memory()[1] + (len(data) if function is loadJSON else 0)
+        tracemalloc.stop()
+        report("%s, 5000 fonts" % function.__name__, duration, 1)
+        print("%-40s %.1f MB" % ("  peak memory", peak / 1024 / 1024))
+
+
+def parents(number=20):
+    """\
+    Resolve the license of every font, then discard the catalog, like a subscription update does.
+    """
+
+    installableFonts = makeCatalog(families=50, fonts=100)
+    usedLicenses = [
+        font.usedLicenses[0] for family in installableFonts.foundries[0].families for font in family.fonts
+    ]
+
+    def getLicenses():
+        for usedLicense in usedLicenses:
+            usedLicense.getLicense()
+
+    report("getLicense, 5000 fonts", timeit.timeit(getLicenses, number=number), number)
+
+    usedLicenses.clear()
+    gc.collect()
+    gc.disable()
+    start = timeit.default_timer()
+    del installableFonts
+    freed = gc.collect()
+    report("discard catalog", timeit.default_timer() - start, 1)
+    print("%-40s %s" % ("  objects left for the cyclic GC", freed))
+    gc.enable()
+
+
+def deepcopies(number=5):
+    """\
+    Copy a catalog of 10000 fonts and change one license usage in the copy.
+    """
+
+    installableFonts = makeCatalog(families=100, fonts=100)
+
+    def copyAndChange():
+        other = copy.deepcopy(installableFonts)
+        other.foundries[0].families[50].fonts[50].usedLicenses[0].seatsInstalled = 2
+        return other
+
+    report("deepcopy", timeit.timeit(lambda: copy.deepcopy(installableFonts), number=number), number)
+    report("deepcopy + change one LicenseUsage", timeit.timeit(copyAndChange, number=number), number)
+    other = copyAndChange()
+    report("dumpJSON of the copy", timeit.timeit(other.dumpJSON, number=1), 1)
+
+
+def snapshots(number=3):
+    """\
+    Freeze a catalog of 10000 fonts for publishing, then compare it to the previous one.
+    """
+
+    installableFonts = makeCatalog(families=100, fonts=100)
+    other = makeCatalog(families=100, fonts=100)
+    other.foundries[0].families[50].fonts[50].usedLicenses[0].seatsInstalled = 2
+
+    report("freeze", timeit.timeit(lambda: copy.deepcopy(installableFonts).freeze(), number=number), number)
+    installableFonts.freeze()
+    other.freeze()
+    report(
+        "getContentChanges of frozen catalogs",
+        timeit.timeit(lambda: installableFonts.getContentChanges(other), number=number),
+        number,
+    )
+
+
+def snapshotLoad(number=3):
+    """\
+    Load a saved catalog of 10000 fonts at startup, from JSON and from a binary snapshot.
+    """
+
+    installableFonts = makeCatalog(families=100, fonts=100).freeze()
+    data = installableFonts.dumpJSON(compact=True)
+    snapshot = installableFonts.dumpSnapshot()
+    print("%-40s %s / %s bytes" % ("  JSON / snapshot size", len(data), len(snapshot)))
+
+    def loadJSON():
+        typeworld.api.InstallableFontsResponse().loadJSON(data, lazy=True)
+
+    def loadJSONAndFreeze():
+        o = typeworld.api.InstallableFontsResponse()
+        o.loadJSON(data, lazy=True)
+        o.freeze()
+
+    def loadSnapshotAndFreeze():
+        o = typeworld.api.InstallableFontsResponse()
+        o.loadSnapshot(snapshot)
+        o.freeze()
+
+    report("dumpSnapshot", timeit.timeit(installableFonts.dumpSnapshot, number=number), number)
+    report("loadJSON, lazy", timeit.timeit(loadJSON, number=number), number)
+    report("loadJSON, lazy + freeze", timeit.timeit(loadJSONAndFreeze, number=number), number)
+    report("loadSnapshot + freeze", timeit.timeit(loadSnapshotAndFreeze, number=number), number)
+
+
+def parallelValidation(processes=None):
+    """\
+    Validate a catalog of 10000 fonts from scratch, in this process and in a process pool.
+    """
+
+    processes = processes or os.cpu_count()
+    for label, kwargs in (("validate", {}), ("validate, %s processes" % processes, {"processes": processes})):
+        root = typeworld.api.RootResponse()
+        root.installableFonts = makeCatalog(families=100, fonts=100)
+        report(label, timeit.timeit(lambda: root.validate(**kwargs), number=1), 1)
+
+
+def validationCache():
+    """\
+    Validate a freshly loaded catalog of 5000 fonts twice with a ValidationCache, like a
+    publisher's server that receives the same response again.
+    """
+
+    installableFonts = makeCatalog(families=50, fonts=100)
+    j = installableFonts.dumpJSON(compact=True)
+    with tempfile.TemporaryDirectory() as path:
+        cache = typeworld.api.ValidationCache(path)
+        for label in ("validate, new response", "validate, cached response"):
+            response = typeworld.api.InstallableFontsResponse()
+            response.loadJSON(j)
+            report(label, timeit.timeit(lambda: response.validate(cache=cache), number=1), 1)
+
+
+def jsonCodecs(number=5):
+    """\
+    Read and write a catalog of 5000 fonts with each available JSON codec.
+    """
+
+    installableFonts = makeCatalog(families=50, fonts=100)
+    data = installableFonts.dumpJSON(compact=True).encode()
+    codecs = [typeworld.api.JSONCodec()]
+    if typeworld.api.orjson:
+        codecs.append(typeworld.api.ORJSONCodec())
+
+    default = typeworld.api.jsonCodec
+    for codec in codecs:
+        typeworld.api.jsonCodec = codec
+        response = typeworld.api.InstallableFontsResponse()
+        report(
+            "%s: loadJSON(bytes, lazy=True)" % codec.name,
+            timeit.timeit(lambda: response.loadJSON(data, lazy=True), number=number),
+            number,
+        )
+        report(
+            "%s: dumpJSON(compact=True)" % codec.name,
+            timeit.timeit(lambda: installableFonts.dumpJSON(compact=True), number=number),
+            number,
+        )
+    typeworld.api.jsonCodec = default
+
+
+def recordConstruction(fonts=20000):
+    """\
+    Build the fonts of a 20000-font response from database rows: attribute by attribute,
+    with loadDict() and with Font.fromRecords().
+    """
+
+    fields = ("uniqueID", "postScriptName", "name", "purpose", "format", "designerKeywords", "usedLicenses")
+    rows = [
+        ("font%s" % i, "Font-%s" % i, {"en": "Font %s" % i}, "desktop", "otf", ["designer"], [{"keyword": "eula"}])
+        for i in range(fonts)
+    ]
+
+    def attributes():
+        for uniqueID, postScriptName, name, purpose, format, designerKeywords, usedLicenses in rows:
+            font = typeworld.api.Font()
+            font.uniqueID = uniqueID
+            font.postScriptName = postScriptName
+            font.name.en = name["en"]
+            font.purpose = purpose
+            font.format = format
+            font.designerKeywords = designerKeywords
+            usedLicense = typeworld.api.LicenseUsage()
+            usedLicense.keyword = usedLicenses[0]["keyword"]
+            font.usedLicenses.append(usedLicense)
+
+    def loadDict():
+        for row in rows:
+            typeworld.api.Font().loadDict(dict(zip(fields, row)))
+
+    report("attributes, per font", timeit.timeit(attributes, number=1), fonts)
+    report("loadDict(), per font", timeit.timeit(loadDict, number=1), fonts)
+    report(
+        "Font.fromRecords(), per font",
+        timeit.timeit(lambda: typeworld.api.Font.fromRecords(rows, fields=fields), number=1),
+        fonts,
+    )
+
+
+def streamingDump(families=100, fonts=100):
+    """\
+    Write a response of 10000 fonts as a response body, in one piece and in chunks, and in
+    chunks with the families built from database rows while writing. Peak memory counts
+    what is allocated while writing, on top of the response already in memory.
+    """
+
+    root = typeworld.api.RootResponse()
+    root.installableFonts = makeCatalog(families=families, fonts=fonts)
+    foundry = root.installableFonts.foundries[0]
+    rows = [family.dumpDict() for family in foundry.families]
+    emptyRoot = copy.deepcopy(root)
+    emptyFoundry = emptyRoot.installableFonts.foundries[0]
+    emptyFoundry.families = []
+
+    def dumpJSON():
+        return [root.dumpJSON(compact=True).encode()]
+
+    def dumpJSONChunks():
+        return root.dumpJSONChunks()
+
+    def extended():
+        return emptyRoot.dumpJSONChunks(extend={emptyFoundry.families: iter(rows)})
+
+    for label, function in (
+        ("dumpJSON(compact=True)", dumpJSON),
+        ("dumpJSONChunks()", dumpJSONChunks),
+        ("dumpJSONChunks(extend=)", extended),
+    ):
+        firstChunk = timeit.timeit(lambda: next(iter(function())), number=1)
+        total = timeit.timeit(lambda: sum(len(chunk) for chunk in function()), number=1)
+        tracemalloc.start()
+        sum(len(chunk) for chunk in function())
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        report("%s, first chunk" % label, firstChunk, 1)
+        report("%s, whole body" % label, total, 1)
+        print("%-40s %.1f MB" % ("  peak memory", peak / 1024 / 1024))
+
+
+def jsonFragments(number=20):
+    """\
+    Write per-request copies of a frozen catalog of 1000 fonts, each with one license usage
+    changed, as JSON. Frozen parts keep their text, so only the changed path is serialized.
+    """
+
+    template = makeCatalog()
+    plain = makeCatalog()
+    template.freeze()
+    template.dumpJSON(compact=True)
+    template.dumpJSON()
+
+    def request(catalog):
+        catalog = copy.deepcopy(catalog)
+        catalog.foundries[0].families[3].fonts[7].usedLicenses[0].seatsInstalled = 2
+        return catalog
+
+    for compact in (True, False):
+        label = "compact" if compact else "indented"
+        report(
+            "dumpJSON(), %s, unfrozen catalog" % label,
+            timeit.timeit(lambda: request(plain).dumpJSON(compact=compact), number=number),
+            number,
+        )
+        report(
+            "dumpJSON(), %s, frozen catalog" % label,
+            timeit.timeit(lambda: request(template).dumpJSON(compact=compact), number=number),
+            number,
+        )
+
+
+if __name__ == "__main__":
+    attributeAccess()
+    catalogScan()
+    validation()
+    validationLevels()
+    serialization()
+    comparison()
+    lookups()
+    contentChanges()
+    versions()
+    texts()
+    textValidation()
+    streamingLoad()
+    parents()
+    deepcopies()
+    snapshots()
+    snapshotLoad()
+    parallelValidation()
+    validationCache()
+    jsonCodecs()
+    recordConstruction()
+    streamingDump()
+    jsonFragments()
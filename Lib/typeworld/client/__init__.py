@@ -28,7 +28,6 @@ import google.api_core.exceptions
 import typeworld.api
 
 from typeworld.client.helpers import (
-    ReadFromFile,
     WriteToFile,
     MachineName,
     OSName,
@@ -420,13 +419,15 @@ class JSON(Preferences):
         self._dict = {}
 
         if self.path and os.path.exists(self.path):
-            self._dict = json.loads(ReadFromFile(self.path))
+            # Read as bytes, which the JSON codec parses without decoding them first
+            with open(self.path, "rb") as f:
+                self._dict = typeworld.api.jsonCodec.loads(f.read())
 
     def save(self):
 
         if not os.path.exists(os.path.dirname(self.path)):
             os.makedirs(os.path.dirname(self.path))
-        WriteToFile(self.path, json.dumps(self._dict))
+        WriteToFile(self.path, typeworld.api.jsonCodec.dumps(self._dict, compact=True))
 
     def dictionary(self):
         return self._dict
@@ -804,6 +805,8 @@ class APIClient(object):
         inCompiledApp=False,
         commercial=False,
         appID="world.type.headless",
+        validationLevel=typeworld.api.STANDARD,
+        maxResponseSize=None,
     ):
 
         try:
@@ -828,6 +831,8 @@ class APIClient(object):
             self.inCompiledApp = inCompiledApp
             self.commercial = commercial
             self.appID = appID
+            self.validationLevel = validationLevel  # see typeworld.api.Validator
+            self.maxResponseSize = maxResponseSize  # in bytes, None for no limit
 
             self._pubSubCallbacks = {}
             self.messageQueueAge = None
@@ -3402,11 +3407,7 @@ class APISubscription(object):
     def familyByID(self, ID):
         try:
             success, installabeFontsCommand = self.protocol.installableFontsCommand()
-
-            for foundry in installabeFontsCommand.foundries:
-                for family in foundry.families:
-                    if family.uniqueID == ID:
-                        return family
+            return installabeFontsCommand.getFamilyByUniqueID(ID)
         except Exception as e:  # nocoverage
             self.parent.parent.handleTraceback(  # nocoverage
                 sourceMethod=getattr(self, sys._getframe().f_code.co_name), e=e
@@ -3415,12 +3416,7 @@ class APISubscription(object):
     def fontByID(self, ID):
         try:
             success, installabeFontsCommand = self.protocol.installableFontsCommand()
-
-            for foundry in installabeFontsCommand.foundries:
-                for family in foundry.families:
-                    for font in family.fonts:
-                        if font.uniqueID == ID:
-                            return font
+            return installabeFontsCommand.getFontByUniqueID(ID)
         except Exception as e:  # nocoverage
             self.parent.parent.handleTraceback(  # nocoverage
                 sourceMethod=getattr(self, sys._getframe().f_code.co_name), e=e
@@ -1,11 +1,25 @@
+import base64
+import codecs
+import hashlib
 import typeworld.client.protocols
 import typeworld.api
 import requests
 import requests.exceptions
 from typeworld.api import VERSION
 
+# Size of the pieces in which responses are read and parsed
+CHUNKSIZE = 64 * 1024
 
-def readJSONResponse(url, responses, acceptableMimeTypes, data={}):
+
+def readJSONResponse(
+    url,
+    responses,
+    acceptableMimeTypes,
+    data={},
+    maxSize=None,
+    validationLevel=typeworld.api.EXHAUSTIVE,
+    validationCache=None,
+):
     d = {}
     d["errors"] = []
     d["warnings"] = []
@@ -21,7 +35,7 @@ def readJSONResponse(url, responses, acceptableMimeTypes, data={}):
     data["commands"] = ",".join(commands)
 
     try:
-        response = requests.post(url, data, timeout=30)
+        response = requests.post(url, data, timeout=30, stream=True)
     except requests.exceptions.ConnectionError:
         d["errors"].append(f"Connection refused: {url}")
         return root, d
@@ -49,8 +63,15 @@ def readJSONResponse(url, responses, acceptableMimeTypes, data={}):
 
         # Catching ValueErrors
         try:
-            root.loadJSON(response.text)
-            information, warnings, errors = root.validate()
+            # Objects are built while the response comes in, see DictBasedObject.loadJSONChunks()
+            # Decoded with the charset of the response, like Response.text, where there is a known one
+            encoding = response.encoding or "utf-8"
+            try:
+                codecs.lookup(encoding)
+            except LookupError:
+                encoding = "utf-8"
+            root.loadJSONChunks(response.iter_content(chunk_size=CHUNKSIZE), maxSize=maxSize, encoding=encoding)
+            information, warnings, errors = root.validate(level=validationLevel, cache=validationCache)
 
             if information:
                 d["information"].extend(information)
@@ -60,10 +81,19 @@ def readJSONResponse(url, responses, acceptableMimeTypes, data={}):
                 d["errors"].extend(errors)
         except ValueError as e:
             d["errors"].append(str(e))
+        except requests.exceptions.RequestException:
+            d["errors"].append(f"Connection interrupted: {url}")
+
+    response.close()
 
     return root, d
 
 
+def sourceDigest(source):
+    # Ties a snapshot to the JSON that it was saved with, see TypeWorldProtocol.loadSnapshot()
+    return hashlib.blake2b(source.encode(), digest_size=16).hexdigest()
+
+
 class TypeWorldProtocol(typeworld.client.protocols.TypeWorldProtocolBase):
     def initialize(self):
         self.versions = []
@@ -81,10 +111,12 @@ class TypeWorldProtocol(typeworld.client.protocols.TypeWorldProtocolBase):
             self._endpointCommand = api
 
         if self.get("installableFonts"):
-            api = typeworld.api.InstallableFontsResponse()
-            api.parent = self
-            api.loadJSON(self.get("installableFonts"))
-            self._installableFontsCommand = api
+            api = self.loadSnapshot("installableFonts", typeworld.api.InstallableFontsResponse)
+            if not api:
+                api = typeworld.api.InstallableFontsResponse()
+                api.parent = self
+                api.loadJSON(self.get("installableFonts"), lazy=True)
+            self._installableFontsCommand = api.freeze()
 
         if self.get("installFonts"):
             api = typeworld.api.InstallFontsResponse()
@@ -92,6 +124,36 @@ class TypeWorldProtocol(typeworld.client.protocols.TypeWorldProtocolBase):
             api.loadJSON(self.get("installFonts"))
             self._installFontsCommand = api
 
+    def loadSnapshot(self, key, responseClass):
+        # Returns the response restored from the binary snapshot that save() keeps next to
+        # the JSON under key, if it was made from that same JSON and with the current data format.
+        # Returns None otherwise, and the JSON needs to be loaded instead.
+        snapshot = self.get(key + "Snapshot")
+        if not snapshot or not snapshot.startswith(sourceDigest(self.get(key)) + ":"):
+            return None
+        api = responseClass()
+        api.parent = self
+        try:
+            api.loadSnapshot(base64.b64decode(snapshot.split(":", 1)[1]))
+        except ValueError:
+            return None
+        return api
+
+    def saveSnapshot(self, key, command, source):
+        self.set(key + "Snapshot", "%s:%s" % (sourceDigest(source), base64.b64encode(command.dumpSnapshot()).decode()))
+
+    def validationLevel(self):
+        # Level that responses are validated at, see APIClient
+        if self.client is not None:
+            return self.client.validationLevel
+        return typeworld.api.EXHAUSTIVE
+
+    def maxResponseSize(self):
+        # Size in bytes beyond which responses are rejected, see APIClient
+        if self.client is not None:
+            return self.client.maxResponseSize
+        return None
+
     def latestVersion(self):
         return self._installableFontsCommand
 
@@ -111,6 +173,8 @@ class TypeWorldProtocol(typeworld.client.protocols.TypeWorldProtocolBase):
                 [typeworld.api.EndpointResponse()],
                 typeworld.api.INSTALLABLEFONTSCOMMAND["acceptableMimeTypes"],
                 data=data,
+                validationLevel=self.validationLevel(),
+                maxSize=self.maxResponseSize(),
             )
 
             # Errors
@@ -139,6 +203,8 @@ class TypeWorldProtocol(typeworld.client.protocols.TypeWorldProtocolBase):
                 [typeworld.api.EndpointResponse()],
                 typeworld.api.INSTALLABLEFONTSCOMMAND["acceptableMimeTypes"],
                 data=data,
+                validationLevel=self.validationLevel(),
+                maxSize=self.maxResponseSize(),
             )
 
             # Errors
@@ -182,6 +248,8 @@ class TypeWorldProtocol(typeworld.client.protocols.TypeWorldProtocolBase):
             ],
             typeworld.api.INSTALLABLEFONTSCOMMAND["acceptableMimeTypes"],
             data=data,
+            validationLevel=self.validationLevel(),
+            maxSize=self.maxResponseSize(),
         )
 
         if responses["errors"]:
@@ -237,16 +305,21 @@ class TypeWorldProtocol(typeworld.client.protocols.TypeWorldProtocolBase):
         # 			return False, 'Couldn’t uninstall previously installed fonts: %s' %
         # message, True
 
+        # Readers in other threads keep using the previous snapshot until it is swapped
+        # for the new one below, in a single assignment
+        installableFonts = root.installableFonts.freeze()
+        previousInstallableFonts = self._installableFontsCommand
+
         # Previously available fonts
         oldIDs = []
-        for foundry in self._installableFontsCommand.foundries:
+        for foundry in previousInstallableFonts.foundries:
             for family in foundry.families:
                 for font in family.fonts:
                     oldIDs.append(font.uniqueID)
 
         # Newly available fonts
         newIDs = []
-        for foundry in root.installableFonts.foundries:
+        for foundry in installableFonts.foundries:
             for family in foundry.families:
                 for font in family.fonts:
                     newIDs.append(font.uniqueID)
@@ -257,7 +330,7 @@ class TypeWorldProtocol(typeworld.client.protocols.TypeWorldProtocolBase):
         deleteTheseFonts = []
         if deletedFonts:
             for fontID in deletedFonts:
-                for foundry in self._installableFontsCommand.foundries:
+                for foundry in previousInstallableFonts.foundries:
                     for family in foundry.families:
                         for font in family.fonts:
                             if font.uniqueID == fontID:
@@ -273,10 +346,10 @@ class TypeWorldProtocol(typeworld.client.protocols.TypeWorldProtocolBase):
                 )
 
         # Compare
-        changes = self._installableFontsCommand.getContentChanges(root.installableFonts)
+        changes = previousInstallableFonts.getContentChanges(installableFonts)
 
         # Success
-        self._installableFontsCommand = root.installableFonts
+        self._installableFontsCommand = installableFonts
 
         # EndpointResponse
         if root.endpoint:
@@ -293,7 +366,7 @@ class TypeWorldProtocol(typeworld.client.protocols.TypeWorldProtocolBase):
         return True, None, changes
 
     def setInstallableFontsCommand(self, command):
-        self._installableFontsCommand = command
+        self._installableFontsCommand = command.freeze()
 
     # 		self.client.delegate.subscriptionWasUpdated(self.subscription.parent,
     # self.subscription)
@@ -324,6 +397,8 @@ class TypeWorldProtocol(typeworld.client.protocols.TypeWorldProtocolBase):
             commands,
             typeworld.api.UNINSTALLFONTSCOMMAND["acceptableMimeTypes"],
             data=data,
+            validationLevel=self.validationLevel(),
+            maxSize=self.maxResponseSize(),
         )
         api = root.uninstallFonts
 
@@ -382,6 +457,8 @@ class TypeWorldProtocol(typeworld.client.protocols.TypeWorldProtocolBase):
                 commands,
                 typeworld.api.INSTALLFONTSCOMMAND["acceptableMimeTypes"],
                 data=data,
+                validationLevel=self.validationLevel(),
+                maxSize=self.maxResponseSize(),
             )
             api = root.installFonts
 
@@ -441,6 +518,8 @@ class TypeWorldProtocol(typeworld.client.protocols.TypeWorldProtocolBase):
             ],
             typeworld.api.INSTALLABLEFONTSCOMMAND["acceptableMimeTypes"],
             data=data,
+            validationLevel=self.validationLevel(),
+            maxSize=self.maxResponseSize(),
         )
 
         # Errors
@@ -480,7 +559,7 @@ class TypeWorldProtocol(typeworld.client.protocols.TypeWorldProtocolBase):
         # Success
         self._rootCommand = root
         self._endpointCommand = root.endpoint
-        self._installableFontsCommand = root.installableFonts
+        self._installableFontsCommand = root.installableFonts.freeze()
 
         # InstallFontsResponse
         if root.installFonts:
@@ -496,12 +575,14 @@ class TypeWorldProtocol(typeworld.client.protocols.TypeWorldProtocolBase):
     def save(self):
 
         assert self._endpointCommand
-        self.set("endpoint", self._endpointCommand.dumpJSON(validate=False))
+        self.set("endpoint", self._endpointCommand.dumpJSON(validate=False, compact=True))
 
         assert self._installableFontsCommand
-        self.set("installableFonts", self._installableFontsCommand.dumpJSON(validate=False))
+        installableFonts = self._installableFontsCommand.dumpJSON(validate=False, compact=True)
+        self.set("installableFonts", installableFonts)
+        self.saveSnapshot("installableFonts", self._installableFontsCommand, installableFonts)
 
         if self._installFontsCommand:
-            self.set("installFonts", self._installFontsCommand.dumpJSON(validate=False))
+            self.set("installFonts", self._installFontsCommand.dumpJSON(validate=False, compact=True))
         else:
             self.set("installFonts", "")
@@ -10,6 +10,9 @@ import certifi
 import json
 import unittest
 import tempfile
+import gc
+import weakref
+import threading
 
 # Use local code for local testing, and rely on system-installed module for CI-testing
 CI = os.getenv("CI", "false").lower() != "false"
@@ -58,6 +61,11 @@ from typeworld.api import (  # noqa: E402
     FontListProxy,
     RootResponse,
     EndpointResponse,
+    Validator,
+    ParallelValidator,
+    ValidationCache,
+    JSONCodec,
+    ORJSONCodec,
     Designer,
     LicenseDefinition,
     Version,
@@ -88,9 +96,10 @@ from typeworld.api import (  # noqa: E402
 
 # Constants
 from typeworld.api import COMMANDS, MAC, PUBLISHERTYPES  # noqa: E402
+from typeworld.api import VALIDATIONLEVELS, STRUCTURAL, STANDARD, EXHAUSTIVE  # noqa: E402
 
 # Methods
-from typeworld.api import makeSemVer  # noqa: E402
+from typeworld.api import makeSemVer, parseSemVer  # noqa: E402
 
 from inspect import currentframe, getframeinfo  # noqa: E402
 
@@ -852,6 +861,1041 @@ class TestTypeWorld(unittest.TestCase):
 
         print("test_copy() finished...")
 
+    def test_lazyLoading(self):
+
+        print("test_lazyLoading() started...")
+
+        json = installableFonts.dumpJSON()
+
+        lazy = InstallableFontsResponse()
+        lazy.loadJSON(json, lazy=True)
+
+        # Untouched subtrees are passed through unchanged
+        self.assertEqual(lazy.dumpJSON(), json)
+        self.assertTrue(installableFonts.sameContent(lazy))
+
+        # Materialized on first access
+        font = lazy.foundries[0].families[0].fonts[0]
+        self.assertEqual(font.uniqueID, "yanone-kaffeesatz-regular")
+        self.assertEqual(font.parent.parent.parent, lazy)
+        self.assertEqual(font.getDesigners()[0].keyword, "yanone")
+        self.assertEqual(lazy.dumpJSON(), json)
+        self.assertEqual(lazy.validate(), installableFonts.validate())
+
+        # Raw data with explicit defaults and empty values fingerprints like loaded data
+        d = installableFonts.dumpDict()
+        d["foundries"][0]["families"][0]["fonts"][0]["variableFont"] = False
+        d["foundries"][0]["families"][0]["fonts"][0]["billboardURLs"] = []
+        eager = InstallableFontsResponse()
+        eager.loadDict(d)
+        lazy = InstallableFontsResponse()
+        lazy.loadDict(d, lazy=True)
+        self.assertTrue(lazy.sameContent(eager))
+        self.assertTrue(lazy.sameContent(installableFonts))
+        self.assertEqual(lazy.getContentChanges(eager), {})
+        fingerprint = lazy.fingerprint()
+        self.assertEqual(lazy.foundries[0].families[0].fonts[0].uniqueID, "yanone-kaffeesatz-regular")
+        self.assertEqual(lazy.fingerprint(), fingerprint)
+        self.assertEqual(lazy.foundries[0].families[0].fingerprint(), eager.foundries[0].families[0].fingerprint())
+
+        print("test_lazyLoading() finished...")
+
+    def test_rawValueStorage(self):
+
+        print("test_rawValueStorage() started...")
+
+        i2 = copy.deepcopy(installableFonts)
+        family = i2.foundries[0].families[0]
+        font = family.fonts[0]
+
+        # Fields are stored as plain values, list members without wrappers
+        self.assertEqual(type(font._content["uniqueID"]), str)
+        self.assertEqual(type(family._content["fonts"]), FontListProxy)
+        self.assertEqual(type(family._content["fonts"].value[0]), Font)
+
+        # Type checks still apply
+        with self.assertRaises(ValueError):
+            font.variableFont = "yes"
+        with self.assertRaises(ValueError):
+            family.fonts.append(Family())
+
+        # Parent links
+        self.assertEqual(font.parent, family)
+        self.assertEqual(font.name.parent, font)
+        self.assertEqual(font.usedLicenses[0].parent, font)
+        self.assertEqual(i2.designers[0].parent, i2)
+
+        print("test_rawValueStorage() finished...")
+
+    def test_attributeDescriptors(self):
+
+        print("test_attributeDescriptors() started...")
+
+        font = Font()
+        font.set("uniqueID", "font")
+        self.assertEqual(font.uniqueID, "font")
+        self.assertEqual(font.get("uniqueID"), "font")
+        self.assertEqual(font.__dict__["_content"]["uniqueID"], "font")
+
+        # MultiLanguageText language keys
+        text = MultiLanguageText()
+        text.de = "Schrift"
+        self.assertEqual(text.get("de"), "Schrift")
+        self.assertEqual(text.getText(["de"]), "Schrift")
+
+        # Keys of other classes and unknown attributes aren't touched
+        self.assertFalse(hasattr(text, "uniqueID"))
+        font.notInStructure = "a"
+        self.assertEqual(font.__dict__["notInStructure"], "a")
+        self.assertNotIn("notInStructure", font._content)
+
+        print("test_attributeDescriptors() finished...")
+
+    def test_Validator(self):
+
+        print("test_Validator() started...")
+
+        i2 = copy.deepcopy(installableFonts)
+        i2.foundries[0].families[0].fonts[0].designerKeywords = ["gfknlergerg"]
+        i2.foundries[0].licenses[0].keyword = ""
+        information, warnings, critical = Validator().validate(i2)
+
+        # Issues are structured until displayed
+        self.assertEqual(
+            [issue.code for issue in critical],
+            ["requiredAttribute", "unknownLicense", "unknownDesigner", "unknownLicense"],
+        )
+        self.assertEqual(critical[2].args[0], "gfknlergerg")
+        self.assertEqual(critical[2].path[-1][2], i2.foundries[0].families[0].fonts[0])
+        self.assertEqual([str(issue) for issue in critical], i2.validate()[2])
+
+        # Nested responses are validated once
+        root = RootResponse()
+        root.installableFonts = copy.deepcopy(installableFonts)
+        root.installableFonts.foundries.append(copy.deepcopy(root.installableFonts.foundries[0]))
+        self.assertEqual(
+            root.validate()[2][0],
+            "<RootResponse>.installableFonts --> <InstallableFontsResponse> --> "
+            "Duplicate unique foundry IDs: ['yanone']",
+        )
+        self.assertEqual(len(root.validate()[2]), 3)
+
+        print("test_Validator() finished...")
+
+    def test_incrementalValidation(self):
+
+        print("test_incrementalValidation() started...")
+
+        i2 = copy.deepcopy(installableFonts)
+        family = i2.foundries[0].families[0]
+        font = family.fonts[0]
+        self.assertEqual(i2.validate()[2], [])
+        self.assertFalse(i2._dirty or family._dirty or font._dirty)
+
+        # Changes flag the path up to the root only
+        font.usedLicenses[0].seatsInstalled = 3
+        self.assertTrue(font.usedLicenses[0]._dirty and font._dirty and family._dirty and i2._dirty)
+        self.assertFalse(family.fonts[1]._dirty)
+        self.assertEqual(i2.validate()[2], [])
+        self.assertFalse(i2._dirty)
+
+        # Cross-references are checked again for unchanged subtrees
+        i2.designers[0].keyword = "someoneElse"
+        self.assertFalse(font._dirty)
+        self.assertEqual(i2.validate()[2], copy.deepcopy(i2).validate()[2])
+        self.assertEqual(len(i2.validate()[2]), 3)
+        i2.designers[0].keyword = "yanone"
+        self.assertEqual(i2.validate()[2], [])
+
+        family.fonts[1].uniqueID = font.uniqueID
+        self.assertEqual(
+            i2.validate()[2],
+            ["<InstallableFontsResponse> --> Duplicate unique family IDs: ['yanone-kaffeesatz-regular']"],
+        )
+
+        # Changes below objects that are already flagged, and in defaults made after validating
+        family.fonts[1].uniqueID = "other"
+        fingerprint = i2.fingerprint()
+        self.assertEqual(i2.validate()[2], [])
+        family.fonts[1].usedLicenses[0].seatsInstalled = 7
+        family.fonts[1].usedLicenses[0].seatsInstalled = 8
+        self.assertNotEqual(i2.fingerprint(), fingerprint)
+        family.fonts[1].uniqueID = font.uniqueID
+        self.assertIsNone(i2.getFontByUniqueID("other"))
+        family.fonts[1].uniqueID = "other"
+        self.assertEqual(i2.validate()[2], [])
+        i2.fingerprint()
+        family.fonts[1].versions.append(Version())
+        family.fonts[1].versions[-1].number = "1.0"
+        family.fonts[1].versions[-1].description.en = "<b>HTML</b>"
+        self.assertEqual(len(i2.validate()[2]), 1)
+        fresh = InstallableFontsResponse()
+        fresh.loadDict(i2.dumpDict(validate=False))
+        self.assertEqual(i2.fingerprint(), fresh.fingerprint())
+
+        print("test_incrementalValidation() finished...")
+
+    def test_compactJSON(self):
+
+        print("test_compactJSON() started...")
+
+        compact = installableFonts.dumpJSON(compact=True)
+        self.assertNotIn("\n", compact)
+        self.assertEqual(json.loads(compact), json.loads(installableFonts.dumpJSON()))
+
+        i2 = InstallableFontsResponse()
+        i2.loadJSON(compact)
+        self.assertTrue(installableFonts.sameContent(i2))
+        self.assertEqual(i2.dumpDict(), installableFonts.dumpDict())
+
+        print("test_compactJSON() finished...")
+
+    def test_jsonCodecs(self):
+
+        print("test_jsonCodecs() started...")
+
+        codecs = [JSONCodec()]
+        if typeworld.api.orjson:
+            codecs.append(ORJSONCodec())
+
+        for payload in (root, designer, font, family, foundry, installableFonts):
+            d = payload.dumpDict()
+            text = json.dumps(d, indent=4, sort_keys=True)
+            for codec in codecs:
+                # Indented output is the same for all codecs, compact output reads the same
+                self.assertEqual(codec.dumps(d), text)
+                self.assertEqual(codec.loads(text), d)
+                self.assertEqual(codec.loads(text.encode()), d)
+                for other in codecs:
+                    self.assertEqual(other.loads(codec.dumps(d, compact=True)), d)
+
+            # loadJSON() takes bytes as well
+            for j in (payload.dumpJSON(), payload.dumpJSON(compact=True).encode()):
+                loaded = payload.__class__()
+                loaded.loadJSON(j)
+                self.assertEqual(loaded.dumpJSON(), text)
+
+        for codec in codecs:
+            self.assertEqual(codec.loads('[1.5, "Grüße", null, Infinity]'), [1.5, "Grüße", None, float("inf")])
+            with self.assertRaises(ValueError) as cm:
+                codec.loads('{"a": 1,}')
+            self.assertEqual(
+                str(cm.exception), "Expecting property name enclosed in double quotes: line 1 column 9 (char 8)"
+            )
+            for number in (2**64 + 1, -(2**63) - 1, 2**63, -(2**63)):
+                for compact in (True, False):
+                    loaded = codec.loads(codec.dumps({"a": [number]}, compact=compact).encode())
+                    self.assertEqual(loaded, {"a": [number]})
+                    self.assertIs(type(loaded["a"][0]), int)
+            self.assertEqual(codec.loads(str(2**64 + 1)), 2**64 + 1)
+            data = '["12345678901234567890", 1.123456789012345678]'
+            self.assertEqual(codec.loads(data), ["12345678901234567890", 1.123456789012345678])
+
+            # NaN and Infinity are rejected rather than written differently by each codec
+            for value in (float("nan"), float("inf"), -float("inf")):
+                for compact in (True, False):
+                    with self.assertRaises(ValueError):
+                        codec.dumps({"a": [1, None, {"b": value}]}, compact=compact)
+            self.assertEqual(codec.dumps({"a": [1.5, None]}, compact=True), '{"a":[1.5,null]}')
+
+        print("test_jsonCodecs() finished...")
+
+    def test_dumpJSONChunks(self):
+
+        print("test_dumpJSONChunks() started...")
+
+        rootResponse = RootResponse()
+        rootResponse.endpoint = copy.deepcopy(root)
+        rootResponse.installableFonts = copy.deepcopy(installableFonts)
+        for o in (rootResponse, installableFonts, foundry, family, font):
+            for chunkSize in (1, 1000, 64 * 1024):
+                chunks = list(o.dumpJSONChunks(chunkSize=chunkSize))
+                self.assertEqual(b"".join(chunks), o.dumpJSON(compact=True).encode())
+                self.assertTrue(all(chunk for chunk in chunks))
+            self.assertEqual(json.loads(b"".join(o.dumpJSONChunks())), json.loads(o.dumpJSON()))
+
+        # Families added while writing, as objects or as dictionaries
+        i2 = copy.deepcopy(installableFonts)
+        newFamilies = [copy.deepcopy(family) for i in range(3)]
+        for i, newFamily in enumerate(newFamilies):
+            newFamily.uniqueID = "family%s" % i
+            for newFont in newFamily.fonts:
+                newFont.uniqueID = "family%s-%s" % (i, newFont.uniqueID)
+        records = [newFamilies[1], newFamilies[2].dumpDict()]
+        families = i2.foundries[0].families
+        chunks = b"".join(i2.dumpJSONChunks(validate=True, extend={families: iter(records)}))
+        for newFamily in newFamilies[1:]:
+            families.append(newFamily)
+        self.assertEqual(chunks, i2.dumpJSON(compact=True).encode())
+
+        # Into an empty list
+        i2.foundries[0].families = []
+        chunks = b"".join(i2.dumpJSONChunks(extend={i2.foundries[0].families: newFamilies[:1]}))
+        self.assertEqual(json.loads(chunks)["foundries"][0]["families"], [newFamilies[0].dumpDict()])
+
+        # Added members are validated one by one
+        newFamilies[0].fonts[0].designerKeywords = ["unknownDesigner"]
+        with self.assertRaises(ValueError):
+            b"".join(i2.dumpJSONChunks(validate=True, extend={i2.foundries[0].families: newFamilies[:1]}))
+
+        with self.assertRaises(ValueError):
+            b"".join(i2.dumpJSONChunks(extend={i2.designers: []}))
+
+        print("test_dumpJSONChunks() finished...")
+
+    def test_jsonFragments(self):
+
+        print("test_jsonFragments() started...")
+
+        template = copy.deepcopy(installableFonts)
+        expected = {compact: template.dumpJSON(compact=compact) for compact in (True, False)}
+        template.freeze()
+        for compact in (True, False):
+            self.assertEqual(template.dumpJSON(compact=compact), expected[compact])
+            self.assertEqual(template.dumpJSON(compact=compact), expected[compact])
+        self.assertEqual(len(template.__dict__["_jsonFragments"]), 2)
+
+        # A copy with one change writes the same text as an unfrozen equivalent
+        i2 = copy.deepcopy(template)
+        i2.foundries[0].families[0].fonts[0].usedLicenses[0].seatsInstalled = 3
+        self.assertFalse(i2.foundries[0].families[0]._frozen)
+        texts = {compact: i2.dumpJSON(compact=compact) for compact in (True, False)}
+        self.assertIn("_jsonFragments", template.foundries[0].families[0].fonts[1].__dict__)
+        self.assertNotIn('"seatsInstalled": 3', template.dumpJSON())
+        unfrozen = InstallableFontsResponse()
+        unfrozen.loadDict(i2.dumpDict())
+        for compact in (True, False):
+            self.assertEqual(texts[compact], unfrozen.dumpJSON(compact=compact))
+        self.assertEqual(b"".join(i2.dumpJSONChunks(chunkSize=100)), unfrozen.dumpJSON(compact=True).encode())
+
+        # discardThisKey() still applies around frozen parts
+        i2.response = "error"
+        i2.errorMessage.en = "Error"
+        self.assertNotIn("foundries", json.loads(i2.dumpJSON()))
+        self.assertNotIn("foundries", json.loads(b"".join(i2.dumpJSONChunks())))
+
+        # dumpDict() returns dictionaries of its own
+        d = i2.dumpDict(validate=False)
+        self.assertEqual(json.loads(i2.dumpJSON(compact=True)), d)
+        d["errorMessage"]["en"] = "Changed"
+        self.assertEqual(i2.errorMessage.en, "Error")
+
+        print("test_jsonFragments() finished...")
+
+    def test_fingerprint(self):
+
+        print("test_fingerprint() started...")
+
+        i2 = copy.deepcopy(installableFonts)
+        self.assertEqual(i2.fingerprint(), installableFonts.fingerprint())
+
+        # Lazily loaded subtrees have the same fingerprint as loaded ones
+        lazy = InstallableFontsResponse()
+        lazy.loadJSON(installableFonts.dumpJSON(), lazy=True)
+        self.assertEqual(lazy.fingerprint(), installableFonts.fingerprint())
+
+        # Changes are picked up all the way to the root
+        font = i2.foundries[0].families[0].fonts[0]
+        fingerprint = font.fingerprint()
+        font.usedLicenses[0].seatsInstalled = 3
+        self.assertNotEqual(font.fingerprint(), fingerprint)
+        self.assertFalse(i2.sameContent(installableFonts))
+        seatsInstalled = installableFonts.foundries[0].families[0].fonts[0].usedLicenses[0].seatsInstalled
+        font.usedLicenses[0].seatsInstalled = seatsInstalled
+        self.assertTrue(i2.sameContent(installableFonts))
+
+        # Same values of different types are told apart, like JSON does
+        font.variableFont = True
+        other = copy.deepcopy(i2)
+        other.foundries[0].families[0].fonts[0].versions[0].number = "1.0"
+        i2.foundries[0].families[0].fonts[0].versions[0].number = "1"
+        self.assertFalse(i2.sameContent(other))
+
+        print("test_fingerprint() finished...")
+
+    def test_indexes(self):
+
+        print("test_indexes() started...")
+
+        i2 = copy.deepcopy(installableFonts)
+        foundry = i2.foundries[0]
+        family = foundry.families[0]
+        font = family.fonts[0]
+
+        self.assertEqual(i2.getFontByUniqueID(font.uniqueID), font)
+        self.assertEqual(i2.getFamilyByUniqueID(family.uniqueID), family)
+        self.assertEqual(i2.getFoundryByUniqueID(foundry.uniqueID), foundry)
+        self.assertEqual(i2.getDesignerByKeyword("yanone"), i2.designers[0])
+        self.assertEqual(foundry.getLicenseByKeyword("yanoneEULA"), foundry.licenses[0])
+        self.assertEqual(i2.getFontByUniqueID("unknown"), None)
+
+        # Other changes keep the index
+        index = i2._index()
+        font.usedLicenses[0].seatsInstalled = 3
+        self.assertIs(i2._index(), index)
+
+        # Changed IDs and keywords
+        font.uniqueID = "renamed"
+        self.assertEqual(i2.getFontByUniqueID("renamed"), font)
+        self.assertEqual(i2.getFontByUniqueID("yanone-kaffeesatz-regular"), None)
+        i2.designers[0].keyword = "someoneElse"
+        self.assertEqual(i2.getDesignerByKeyword("yanone"), None)
+        self.assertEqual(i2.getDesignerByKeyword("someoneElse"), i2.designers[0])
+        foundry.licenses[0].keyword = "otherEULA"
+        self.assertEqual(foundry.getLicenseByKeyword("otherEULA"), foundry.licenses[0])
+
+        # Changed lists
+        newFont = copy.deepcopy(font)
+        newFont.uniqueID = "new"
+        family.fonts.append(newFont)
+        self.assertEqual(i2.getFontByUniqueID("new"), newFont)
+        family.fonts.remove(newFont)
+        self.assertEqual(i2.getFontByUniqueID("new"), None)
+
+        print("test_indexes() finished...")
+
+    def test_getDetailedContentChanges(self):
+
+        print("test_getDetailedContentChanges() started...")
+
+        i2 = copy.deepcopy(installableFonts)
+        changes = installableFonts.getDetailedContentChanges(i2)
+        self.assertEqual(changes.overallChanges, False)
+        self.assertEqual(changes.summary(), {})
+
+        foundry = i2.foundries[0]
+        family = foundry.families[0]
+        font = family.fonts[0]
+
+        # Added and removed fonts and families
+        newFont = copy.deepcopy(font)
+        newFont.uniqueID = "new"
+        family.fonts.append(newFont)
+        newFamily = copy.deepcopy(family)
+        newFamily.uniqueID = "newFamily"
+        newFamily.fonts = []
+        foundry.families.append(newFamily)
+        changes = installableFonts.getDetailedContentChanges(i2)
+        self.assertEqual(changes.addedFonts, ["new"])
+        self.assertEqual(changes.addedFamilies, ["newFamily"])
+        self.assertEqual(changes.removedFonts, [])
+        self.assertEqual(changes.changedKeys, {})
+        self.assertEqual(changes.summary(), {"addedFonts": 1, "overallChanges": True})
+        changes = i2.getDetailedContentChanges(installableFonts)
+        self.assertEqual(changes.removedFonts, ["new"])
+        self.assertEqual(changes.removedFamilies, ["newFamily"])
+        self.assertEqual(i2.getContentChanges(installableFonts), {"removedFonts": 1, "overallChanges": True})
+
+        # Changed keys and new versions
+        i2 = copy.deepcopy(installableFonts)
+        family = i2.foundries[0].families[0]
+        font = family.fonts[0]
+        font.postScriptName = "Changed"
+        version = Version()
+        version.number = "2.0"
+        family.versions.append(version)
+        changes = installableFonts.getDetailedContentChanges(i2)
+        self.assertEqual(changes.changedKeys[("fonts", font.uniqueID)], ["postScriptName"])
+        self.assertEqual(changes.changedKeys[("families", family.uniqueID)], ["versions"])
+        self.assertEqual(changes.fontsWithAddedVersions, [f.uniqueID for f in family.fonts])
+        self.assertEqual(
+            installableFonts.getContentChanges(i2),
+            {"fontsWithAddedVersions": len(family.fonts), "overallChanges": True},
+        )
+
+        # Equal uniqueIDs on different levels don't collide
+        i1 = copy.deepcopy(installableFonts)
+        i1.foundries[0].families[0].uniqueID = "same"
+        i1.foundries[0].families[0].fonts[0].uniqueID = "same"
+        i2 = copy.deepcopy(i1)
+        i2.foundries[0].families[0].dateFirstPublished = "2020-01-01"
+        i2.foundries[0].families[0].fonts[0].postScriptName = "Changed"
+        changes = i1.getDetailedContentChanges(i2)
+        self.assertEqual(changes.changedKeys[("families", "same")], ["dateFirstPublished"])
+        self.assertEqual(changes.changedKeys[("fonts", "same")], ["postScriptName"])
+
+        # Other changes
+        i2 = copy.deepcopy(installableFonts)
+        i2.foundries[0].families[0].fonts[0].usedLicenses[0].seatsInstalled = 3
+        self.assertEqual(installableFonts.getContentChanges(i2), {"overallChanges": True})
+        self.assertEqual(installableFonts.getContentChanges(i2, calculateOverallChanges=False), {})
+
+        print("test_getDetailedContentChanges() finished...")
+
+    def test_versionTimeline(self):
+
+        print("test_versionTimeline() started...")
+
+        self.assertEqual(str(parseSemVer("1.1")), "1.1.0")
+        self.assertIs(parseSemVer("1.1"), parseSemVer("1.1"))
+        for i in range(5000):
+            parseSemVer("1.%s" % i)
+        self.assertLessEqual(parseSemVer.cache_info().currsize, parseSemVer.cache_info().maxsize)
+
+        i2 = copy.deepcopy(installableFonts)
+        family = i2.foundries[0].families[0]
+        font = family.fonts[0]
+        numbers = [version.number for version in font.getVersions()]
+        self.assertEqual(font.getVersions(), font.getVersions())
+
+        # Family version added
+        version = Version()
+        version.number = "10.0"
+        family.versions.append(version)
+        self.assertEqual([v.number for v in font.getVersions()], numbers + ["10.0"])
+
+        # Font version renumbered
+        font.versions[0].number = "0.1"
+        self.assertEqual(font.getVersions()[0].number, "0.1")
+
+        # Replaced
+        version = Version()
+        version.number = "11.0"
+        family.versions = [version]
+        self.assertEqual(font.getVersions()[-1], version)
+
+        print("test_versionTimeline() finished...")
+
+    def test_sparseMultiLanguageText(self):
+
+        print("test_sparseMultiLanguageText() started...")
+
+        text = MultiLanguageText()
+        self.assertEqual(text.de, None)
+        self.assertEqual(text.getText(["de", "fr"]), None)
+        self.assertEqual(text._content, {})
+        self.assertFalse(text.isSet())
+
+        text.fr = "Bonjour"
+        text.de = "Hallo"
+        self.assertEqual(text.getTextAndLocale(["es", "de"]), ("Hallo", "de"))
+        self.assertEqual(text.getTextAndLocale("fr"), ("Bonjour", "fr"))
+
+        # English, then the first language in the order of _possible_keys (French before German)
+        self.assertEqual(text.getTextAndLocale("es"), ("Bonjour", "fr"))
+        text.en = "Hello"
+        self.assertEqual(text.getTextAndLocale(["es"]), ("Hello", "en"))
+
+        # Unset languages are dropped
+        text.en = ""
+        text.set("de", "")
+        self.assertEqual(text._content, {"fr": "Bonjour"})
+        self.assertEqual(text.getText(), "Bonjour")
+        self.assertEqual(text.dumpDict(), {"fr": "Bonjour"})
+
+        text.validate()
+        self.assertEqual(list(text._content), ["fr"])
+
+        print("test_sparseMultiLanguageText() finished...")
+
+    def test_markupScreening(self):
+
+        print("test_markupScreening() started...")
+
+        markdown = "String contains Markdown code, which is not allowed."
+        for string, issues in (
+            ("Semi-Bold Condensed (1.0)", []),
+            ("Black & White", [markdown]),
+            ("**Bold**", [markdown]),
+            ("# Heading", [markdown]),
+            ("1. Item", [markdown]),
+            ("Line\nbreak", []),
+            ("Text\n===", [markdown]),
+            ("<b>Bold</b>", ["String contains HTML code, which is not allowed. String: <b>Bold</b>"]),
+        ):
+            text = MultiLanguageText()
+            text.en = string
+            self.assertEqual(text.customValidation()[2], issues)
+
+            # Memoized
+            text = MultiLanguageText()
+            text.en = string
+            self.assertEqual(text.customValidation()[2], issues)
+
+        text = MultiLanguageLongText()
+        text.en = "**Bold**"
+        self.assertEqual(text.customValidation()[2], [])
+
+        print("test_markupScreening() finished...")
+
+    def test_loadJSONChunks(self):
+
+        print("test_loadJSONChunks() started...")
+
+        data = installableFonts.dumpJSON().encode()
+        for size in (1, 7, 1000, len(data)):
+            i2 = InstallableFontsResponse()
+            i2.loadJSONChunks(data[i : i + size] for i in range(0, len(data), size))
+            self.assertTrue(installableFonts.sameContent(i2))
+            self.assertEqual(type(i2.foundries[0].families[0].fonts[0]), Font)
+            self.assertEqual(i2.foundries[0].families[0].fonts[0].parent.parent.parent, i2)
+
+        # Text chunks and plain data in unknown keys
+        i2 = InstallableFontsResponse()
+        i2.loadJSONChunks(['{"response": "succ', 'ess", "unknown": [1.5, {"a": nu', "ll}]}"])
+        self.assertEqual(i2.response, "success")
+
+        # Bytes in another charset than UTF-8
+        latin1 = '{"response": "success", "userName": {"de": "Gr\u00fc\u00dfe"}}'.encode("latin-1")
+        self.assertRaises(ValueError, InstallableFontsResponse().loadJSONChunks, [latin1])
+        i2 = InstallableFontsResponse()
+        i2.loadJSONChunks([latin1[:-5], latin1[-5:]], encoding="latin-1")
+        self.assertEqual(i2.response, "success")
+        self.assertEqual(i2.userName.de, "Gr\u00fc\u00dfe")
+
+        # Invalid and oversized data
+        for chunks in (['{"response": "success",}'], ['{"response": '], ['{"response": "success"} x']):
+            self.assertRaises(ValueError, InstallableFontsResponse().loadJSONChunks, chunks)
+        try:
+            InstallableFontsResponse().loadJSONChunks([data[:100], data[100:]], maxSize=150)
+        except ValueError as e:
+            self.assertEqual(str(e), "JSON data exceeds the maximum size of 150 bytes")
+
+        # Error positions count from the start of the data
+        damaged = data.replace(b'"uniqueID"', b'"uniqueID",', 1)
+        with self.assertRaises(ValueError) as expected:
+            json.loads(damaged)
+        for size in (1, 7, 1000):
+            with self.assertRaises(ValueError) as context:
+                InstallableFontsResponse().loadJSONChunks(damaged[i : i + size] for i in range(0, len(damaged), size))
+            self.assertEqual(str(context.exception), str(expected.exception))
+
+        print("test_loadJSONChunks() finished...")
+
+    def test_weakParents(self):
+
+        print("test_weakParents() started...")
+
+        i2 = copy.deepcopy(installableFonts)
+        foundry = i2.foundries[0]
+        family = foundry.families[0]
+        font = family.fonts[0]
+        self.assertEqual(font.parent, family)
+        self.assertEqual(font.usedLicenses[0].getLicense(), foundry.licenses[0])
+        self.assertEqual(font._ancestor(InstallableFontsResponse), i2)
+        self.assertEqual(font.name.parent, font)
+
+        # Moved to another foundry
+        foundry2 = copy.deepcopy(foundry)
+        foundry2.uniqueID = "other"
+        foundry2.families = [family]
+        self.assertEqual(font._ancestor(Foundry), foundry2)
+        self.assertEqual(font._ancestor(InstallableFontsResponse), None)
+        i2.foundries.append(foundry2)
+        self.assertEqual(font._ancestor(InstallableFontsResponse), i2)
+
+        # Discarded trees are freed without the cyclic garbage collector
+        gc.disable()
+        try:
+            response = weakref.ref(i2)
+            del i2, foundry, foundry2, family
+            self.assertEqual(response(), None)
+            # A clear error rather than None once the containers are gone
+            with self.assertRaises(ReferenceError):
+                font.parent
+            with self.assertRaises(ReferenceError):
+                font.getVersions()
+            with self.assertRaises(ReferenceError):
+                font.getDesigners()
+            name = font.name
+            del font
+            with self.assertRaises(ReferenceError):
+                name.parent
+        finally:
+            gc.enable()
+
+        # Reading defaults doesn't invalidate the ancestors found so far
+        frozen = Font().freeze()
+        generation = typeworld.api._ParentLink.generation
+        frozen.name, frozen.versions, Font().name
+        self.assertEqual(typeworld.api._ParentLink.generation, generation)
+
+        print("test_weakParents() finished...")
+
+    def test_copyOnWrite(self):
+
+        print("test_copyOnWrite() started...")
+
+        i1 = copy.deepcopy(installableFonts)
+        original = i1.dumpJSON()
+        i2 = copy.deepcopy(i1)
+
+        # Untouched subtrees are shared until written to
+        self.assertTrue(i1.sameContent(i2))
+        self.assertIsInstance(i2._content["foundries"].value[0], typeworld.api._RawSubtree)
+
+        # Changing the copy leaves the original alone
+        usedLicense = i2.foundries[0].families[0].fonts[0].usedLicenses[0]
+        usedLicense.seatsInstalled = 5
+        self.assertEqual(i1.foundries[0].families[0].fonts[0].usedLicenses[0].seatsInstalled, 1)
+        self.assertEqual(i1.dumpJSON(), original)
+        self.assertFalse(i1.sameContent(i2))
+        self.assertEqual(usedLicense.getLicense(), i2.foundries[0].licenses[0])
+        self.assertEqual(usedLicense._ancestor(InstallableFontsResponse), i2)
+
+        # Changing the original leaves the copies alone
+        i3 = copy.deepcopy(i2)
+        i2.foundries[0].families[0].fonts[0].name.en = "Changed"
+        i2.foundries[0].families[0].fonts.append(copy.deepcopy(i2.foundries[0].families[0].fonts[0]))
+        self.assertEqual(i3.foundries[0].families[0].fonts[0].name.en, "Regular")
+        self.assertEqual(len(i3.foundries[0].families[0].fonts), len(i1.foundries[0].families[0].fonts))
+        self.assertEqual(i3.foundries[0].families[0].fonts[0].usedLicenses[0].seatsInstalled, 5)
+        self.assertEqual(i3.foundries[0].families[0].fonts[0].parent, i3.foundries[0].families[0])
+        self.assertEqual(i1.dumpJSON(), original)
+
+        # An original that never changes doesn't collect references to copies that are gone
+        for i in range(1000):
+            i4 = copy.deepcopy(i1)
+            i4.foundries[0].families[0].fonts[0].usedLicenses[0].seatsInstalled = i
+        del i4
+        for node in (i1.foundries[0], i1.foundries[0].families[0], i1.foundries[0].families[0].fonts[0]):
+            self.assertLess(len(node.__dict__.get("_sharedBy", ())), 64)
+
+        # While copies are alive, changes look for them only up to objects already known to have none
+        i5 = InstallableFontsResponse()
+        i5.loadJSON(original)
+        usedLicense = i5.foundries[0].families[0].fonts[0].usedLicenses[0]
+        usedLicense.seatsInstalled = 2
+        stamp = (typeworld.api._RawSubtree.shares, typeworld.api._ParentLink.generation)
+        self.assertEqual(i5.__dict__["_unshared"], stamp)
+        self.assertEqual(usedLicense.__dict__["_unshared"], stamp)
+        # Copying it again invalidates the stamps
+        i6 = copy.deepcopy(i5)
+        usedLicense.seatsInstalled = 3
+        self.assertEqual(i6.foundries[0].families[0].fonts[0].usedLicenses[0].seatsInstalled, 2)
+        self.assertIsNotNone(i3)
+
+        print("test_copyOnWrite() finished...")
+
+    def test_freeze(self):
+
+        print("test_freeze() started...")
+
+        i2 = copy.deepcopy(installableFonts)
+        original = i2.dumpJSON()
+        snapshot = i2.freeze()
+        self.assertIs(snapshot, i2)
+        self.assertEqual(snapshot.dumpJSON(), original)
+        self.assertIsNotNone(snapshot._fingerprint)
+        self.assertIsNotNone(snapshot._indexes)
+
+        font = snapshot.foundries[0].families[0].fonts[0]
+        changes = (
+            lambda: setattr(font, "postScriptName", "Changed"),
+            lambda: setattr(font.name, "de", "Geändert"),
+            lambda: setattr(font.usedLicenses[0], "seatsInstalled", 5),
+            lambda: font.usedLicenses.append(LicenseUsage()),
+            lambda: snapshot.foundries[0].families[0].fonts.put([]),
+            lambda: snapshot.loadJSON(original),
+        )
+        for change in changes:
+            with self.assertRaises(ValueError):
+                change()
+        self.assertEqual(snapshot.dumpJSON(), original)
+
+        # Unset keys read as their default without being stored
+        self.assertEqual(len(font.billboardURLs), 0)
+        with self.assertRaises(ValueError):
+            font.billboardURLs.append("https://typeworldserver.com/billboard.png")
+
+        # Dictionaries are read-only copies, and the lists derived from the data are built right away
+        foundry, family = snapshot.foundries[0], snapshot.foundries[0].families[0]
+        with self.assertRaises(TypeError):
+            foundry.styling["light"]["headerColor"] = "000000"
+        with self.assertRaises(TypeError):
+            Foundry().freeze().styling["light"]["headerColor"] = "000000"
+        self.assertEqual(snapshot.dumpJSON(), original)
+        self.assertEqual(snapshot.validate(), copy.deepcopy(snapshot).validate())
+        self.assertIn("_versionTimeline", font.__dict__)
+        self.assertIn("_designers", font.__dict__)
+        self.assertIn("_allDesigners", family.__dict__)
+        other = Foundry()
+        other.styling = foundry.styling
+        other.styling["light"]["headerColor"] = "000000"
+        self.assertNotEqual(foundry.styling["light"]["headerColor"], "000000")
+
+        # Copies are changeable, and frozen objects are copied into other trees
+        i3 = copy.deepcopy(snapshot)
+        i3.foundries[0].styling["light"]["headerColor"] = "000000"
+        self.assertNotEqual(foundry.styling["light"]["headerColor"], "000000")
+        i3.foundries[0].families[0].fonts[0].postScriptName = "Changed"
+        i3.foundries[0].families[0].fonts.append(font)
+        self.assertIsNot(i3.foundries[0].families[0].fonts[-1], font)
+        self.assertEqual(font.parent, snapshot.foundries[0].families[0])
+        self.assertEqual(snapshot.dumpJSON(), original)
+
+        # Readers see either snapshot in full while another thread swaps them
+        class Holder(object):
+            pass
+
+        holder = Holder()
+        holder.snapshot = snapshot
+        other = copy.deepcopy(snapshot)
+        other.foundries[0].families[0].fonts.append(copy.deepcopy(font))
+        other.freeze()
+        expected = {snapshot.fingerprint(): len(original), other.fingerprint(): len(other.dumpJSON())}
+        failures = []
+
+        def read():
+            for i in range(50):
+                current = holder.snapshot
+                if len(current.dumpJSON()) != expected[current.fingerprint()]:
+                    failures.append(current)
+
+        readers = [threading.Thread(target=read) for i in range(4)]
+        for reader in readers:
+            reader.start()
+        for i in range(200):
+            holder.snapshot = (snapshot, other)[i % 2]
+        for reader in readers:
+            reader.join()
+        self.assertEqual(failures, [])
+
+        # Validating leaves frozen objects as they are
+        contents = [(node, dict(node._content)) for node in (snapshot, font, font.name, font.usedLicenses[0])]
+        self.assertEqual(snapshot.validate(), copy.deepcopy(snapshot).validate())
+        for node, content in contents:
+            self.assertEqual(node._content, content)
+        empty = Font().freeze()
+        self.assertEqual(empty.validate(), Font().validate())
+        self.assertEqual(len(empty._content), len(Font()._content))
+
+        # Parts of a replaced snapshot keep it alive
+        other = copy.deepcopy(snapshot).freeze()
+        otherFont = other.foundries[0].families[0].fonts[0]
+        del other, holder.snapshot
+        gc.collect()
+        self.assertEqual(otherFont.getVersions()[-1].number, font.getVersions()[-1].number)
+        self.assertEqual(otherFont.getDesigners()[0].keyword, font.getDesigners()[0].keyword)
+        self.assertEqual(otherFont.parent.parent.parent.dumpJSON(), original)
+
+        print("test_freeze() finished...")
+
+    def test_snapshot(self):
+
+        print("test_snapshot() started...")
+
+        i2 = copy.deepcopy(installableFonts).freeze()
+        snapshot = i2.dumpSnapshot()
+        self.assertIsInstance(snapshot, bytes)
+
+        i3 = InstallableFontsResponse()
+        i3.loadSnapshot(snapshot)
+        self.assertEqual(i3.dumpJSON(), i2.dumpJSON())
+        self.assertEqual(i3.fingerprint(), i2.fingerprint())
+        self.assertEqual(i3.validate(), i2.validate())
+        font = i3.foundries[0].families[0].fonts[0]
+        self.assertEqual(font.parent, i3.foundries[0].families[0])
+        self.assertEqual(font.name.parent, font)
+        self.assertEqual(font.usedLicenses[0].getLicense(), i3.foundries[0].licenses[0])
+        self.assertEqual(i3.getFontByUniqueID(font.uniqueID), font)
+
+        # Restored objects are changeable like loaded ones
+        font.usedLicenses[0].seatsInstalled = 5
+        self.assertNotEqual(i3.fingerprint(), i2.fingerprint())
+
+        # Lazily loaded parts are included
+        i4 = InstallableFontsResponse()
+        i4.loadJSON(i2.dumpJSON(), lazy=True)
+        i5 = InstallableFontsResponse()
+        i5.loadSnapshot(i4.dumpSnapshot())
+        self.assertEqual(i5.dumpJSON(), i2.dumpJSON())
+
+        # Rejected snapshots
+        with self.assertRaises(ValueError):
+            EndpointResponse().loadSnapshot(snapshot)
+        with self.assertRaises(ValueError):
+            InstallableFontsResponse().loadSnapshot(snapshot[:-100])
+        with self.assertRaises(ValueError):
+            InstallableFontsResponse().loadSnapshot(b"TWSNAP" + bytes(16) + snapshot[22:])
+
+        # Frozen objects keep their snapshot
+        self.assertIs(i2.dumpSnapshot(), snapshot)
+        self.assertIsNot(i3.dumpSnapshot(), i3.dumpSnapshot())
+
+        # Changed defaults and required flags make another schema
+        header = typeworld.api._snapshotSchema()[0]
+        structure = Font._structure
+        for index, value in ((1, False), (2, "beta")):
+            entry = list(structure["status"])
+            entry[index] = value
+            Font._structure = dict(structure, status=entry)
+            typeworld.api._snapshotSchema.cache_clear()
+            try:
+                self.assertNotEqual(typeworld.api._snapshotSchema()[0], header)
+            finally:
+                Font._structure = structure
+                typeworld.api._snapshotSchema.cache_clear()
+        self.assertEqual(typeworld.api._snapshotSchema()[0], header)
+
+        print("test_snapshot() finished...")
+
+    def test_parallelValidation(self):
+
+        print("test_parallelValidation() started...")
+
+        def makeRoot():
+            root = RootResponse()
+            root.installableFonts = copy.deepcopy(installableFonts)
+            foundry = root.installableFonts.foundries[0]
+            foundry.families.append(copy.deepcopy(foundry.families[0]))
+            foundry.families[0].fonts[0].designerKeywords = ["gfknlergerg"]
+            foundry.families[1].fonts[0].usedLicenses[0].keyword = "unknown"
+            foundry.families[1].fonts[0].format = ""
+            return root
+
+        # Same issues in the same order as Validator
+        for strict in (True, False):
+            root = makeRoot()
+            expected = makeRoot().validate(strict=strict)
+            self.assertEqual(len(expected[2]), 5)
+            self.assertEqual(root.validate(strict=strict, processes=2), expected)
+
+            # Family results are kept like Validator's, and changes are picked up
+            self.assertEqual(root.validate(strict=strict), expected)
+            root.installableFonts.foundries[0].families[1].fonts[0].format = "otf"
+            self.assertEqual(len(root.validate(strict=strict, processes=2)[2]), len(expected[2]) - 1)
+
+        information, warnings, critical = ParallelValidator(processes=2).validate(makeRoot().installableFonts)
+        self.assertEqual([issue.code for issue in critical][:2], ["unknownDesigner", "unknownLicense"])
+
+        print("test_parallelValidation() finished...")
+
+    def test_validationLevels(self):
+
+        print("test_validationLevels() started...")
+
+        def makeResponse():
+            response = copy.deepcopy(installableFonts)
+            response.name = MultiLanguageText()
+            foundry = response.foundries[0]
+            foundry.styling = {"light": {"headerColor": "nocolor"}, "purple": {}}
+            foundry.families[0].fonts[0].format = ""
+            foundry.families[0].fonts[1].name.en = "<b>Bold</b>"
+            foundry.families[0].name.en = "**Kaffeesatz**"
+            return response
+
+        levels = {level: makeResponse().validate(level=level) for level in VALIDATIONLEVELS}
+        self.assertEqual(levels[EXHAUSTIVE], makeResponse().validate())
+
+        # Each level adds to the issues of the one before it
+        structural, standard, exhaustive = [levels[level] for level in VALIDATIONLEVELS]
+        self.assertEqual(len(structural[2]), 1)
+        self.assertIn("has no .format value", structural[2][0])
+        self.assertEqual(structural[1], [])
+        self.assertEqual(len(standard[1]), 1)
+        self.assertEqual(len(standard[2]), 3)
+        self.assertTrue(any("Styling keyword 'purple' is unknown" in issue for issue in standard[2]))
+        self.assertTrue(any("String contains HTML code" in issue for issue in standard[2]))
+        self.assertFalse(any("Markdown code" in issue for issue in standard[2]))
+        self.assertEqual(len(exhaustive[2]), 5)
+        self.assertTrue(any("Markdown code" in issue for issue in exhaustive[2]))
+        self.assertLess(set(structural[2]), set(standard[2]))
+        self.assertLess(set(standard[2]), set(exhaustive[2]))
+
+        # Results kept for one level aren't used for another
+        response = makeResponse()
+        self.assertEqual(response.validate(level=STRUCTURAL), structural)
+        self.assertEqual(response.validate(level=EXHAUSTIVE), exhaustive)
+        self.assertEqual(response.validate(level=STANDARD, processes=2), standard)
+
+        with self.assertRaises(ValueError):
+            response.validate(level="thorough")
+
+        # Overrides of customValidation() without the level still work
+        class LegacyResponse(InstallableFontsResponse):
+            def customValidation(self):
+                information, warnings, critical = super().customValidation()
+                return information, warnings, critical + ["Legacy check"]
+
+        response = LegacyResponse()
+        response.loadDict(installableFonts.dumpDict())
+        for level in VALIDATIONLEVELS:
+            self.assertTrue(any("Legacy check" in issue for issue in response.validate(level=level)[2]))
+
+        print("test_validationLevels() finished...")
+
+    def test_validationCache(self):
+
+        print("test_validationCache() started...")
+
+        with tempfile.TemporaryDirectory() as path:
+            cache = ValidationCache(path)
+
+            response = copy.deepcopy(installableFonts)
+            response.foundries[0].families[0].fonts[0].format = ""
+            expected = response.validate()
+            self.assertEqual(response.validate(cache=cache), expected)
+            self.assertEqual(len(os.listdir(path)), 1)
+
+            # A byte-identical response is answered from the cache
+            reloaded = InstallableFontsResponse()
+            reloaded.loadJSON(response.dumpJSON())
+            key = cache.key(reloaded, True, EXHAUSTIVE)
+            self.assertEqual(cache.get(key), expected)
+            self.assertEqual(reloaded.validate(cache=cache), expected)
+
+            # Other content, arguments and subtrees aren't
+            reloaded.foundries[0].families[0].fonts[0].format = "otf"
+            self.assertEqual(reloaded.validate(cache=cache)[2], [])
+            self.assertNotEqual(cache.key(reloaded, False, EXHAUSTIVE), cache.key(reloaded, True, EXHAUSTIVE))
+            self.assertNotEqual(cache.key(reloaded, True, STRUCTURAL), cache.key(reloaded, True, EXHAUSTIVE))
+            reloaded.foundries[0].validate(cache=cache)
+            self.assertEqual(len(os.listdir(path)), 2)
+
+            # Least recently used entries are removed first
+            cache.maxSize = os.path.getsize(os.path.join(path, key + ".json")) * 2
+            cache.get(key)
+            response.validate(strict=False, cache=cache)
+            self.assertEqual(len(os.listdir(path)), 2)
+            self.assertIsNotNone(cache.get(key))
+
+        print("test_validationCache() finished...")
+
+    def test_fromRecords(self):
+
+        print("test_fromRecords() started...")
+
+        # The same objects as with loadDict()
+        records = [font.dumpDict() for font in family.fonts]
+        fonts = Font.fromRecords(records)
+        self.assertEqual(len(fonts), len(records))
+        for record, built in zip(records, fonts):
+            loaded = Font()
+            loaded.loadDict(record)
+            self.assertEqual(built.dumpJSON(), loaded.dumpJSON())
+            self.assertEqual(built.dumpJSON(compact=True), loaded.dumpJSON(compact=True))
+            self.assertIs(built.usedLicenses[0]._owner(), built)
+
+        # Tuples with field names, and objects in records
+        usedLicense = LicenseUsage()
+        usedLicense.keyword = "yanoneEULA"
+        usedLicense.freeze()
+        rows = [("font%s" % i, "Font-%s" % i, {"en": "Font %s" % i, "de": ""}, [usedLicense]) for i in range(3)]
+        fonts = Font.fromRecords(rows, fields=("uniqueID", "postScriptName", "name", "usedLicenses"))
+        self.assertEqual([font.uniqueID for font in fonts], ["font0", "font1", "font2"])
+        self.assertEqual(fonts[2].name.en, "Font 2")
+        self.assertIsNone(fonts[2].name.de)
+        self.assertEqual(fonts[0].status, "stable")
+        self.assertIsNot(fonts[0].usedLicenses[0], fonts[1].usedLicenses[0])
+        fonts[0].usedLicenses[0].keyword = "other"
+        self.assertEqual(fonts[1].usedLicenses[0].keyword, "yanoneEULA")
+
+        # Built objects work like any others in a response
+        i2 = copy.deepcopy(installableFonts)
+        newFamily = Family.fromRecords([dict(family.dumpDict(), uniqueID="other-family")])[0]
+        for font in newFamily.fonts:
+            font.uniqueID = "other-" + font.uniqueID
+        i2.foundries[0].families.append(newFamily)
+        self.assertEqual(i2.validate()[2], [])
+        self.assertEqual(newFamily.fonts[0]._ancestor(InstallableFontsResponse), i2)
+
+        # Values are checked as with loadDict()
+        with self.assertRaises(ValueError):
+            Font.fromRecords([{"uniqueID": "font", "purpose": "unknownPurpose"}])
+
+        print("test_fromRecords() finished...")
+
     def test_InstallableFontsResponse(self):
 
         print("test_InstallableFontsResponse()")